@@ -0,0 +1,6 @@
+import sys
+from assistant_bot.main import main
+
+# Перевірка потрібна, щоб дочірні процеси імпорту (spawn) не запускали бота ще раз
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+import sys # Імпортуємо sys для читання команд зі stdin та виведення звіту
+from assistant_bot.registry import execute_command, unknown_command, EXIT_COMMANDS
+from assistant_bot.utils import parse_input
+
+# Відповіді, що починаються з цих символів, означають, що команду не виконано
+ERROR_MARKS = ("😓", "🤔", "⚠️")
+
+def read_commands(source):
+    if source == "-":
+        yield from sys.stdin
+        return
+    with open(source, encoding="utf-8") as file:
+        yield from file
+
+# Виконує команди по рядку без інтерактивного вводу. Усі зміни робляться в пам'яті,
+# а книга зберігається один раз у кінці (або кожні save_every команд).
+def run_batch(lines, book, storage, save_every=None, out=sys.stdout):
+    counts = {"changed": 0, "ok": 0, "error": 0}
+    executed = 0
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        command, args = parse_input(line)
+        if command in EXIT_COMMANDS:
+            break
+        result, changed = execute_command(command, args, book)
+        if result is None:
+            result, status = unknown_command(command), "error"
+        elif result.startswith(ERROR_MARKS):
+            status = "error"
+        elif changed:
+            status = "changed"
+        else:
+            status = "ok"
+        counts[status] += 1
+        executed += 1
+        first_line = result.splitlines()[0] if result else ""
+        out.write(f"{line_number:>6} {status:<8} {command}: {first_line}\n")
+        if save_every and executed % save_every == 0:
+            storage.save(book)
+    storage.save(book)
+    out.write(
+        f"📊 {executed} commands: {counts['changed']} changed, "
+        f"{counts['ok']} ok, {counts['error']} failed.\n"
+    )
+    return counts
@@ -1,21 +1,44 @@
-from collections import UserDict #Імпортуємо UserDict для створення адресної книги
+from collections import UserDict, OrderedDict #Імпортуємо UserDict для створення адресної книги та OrderedDict для кешу прочитаних записів
 from datetime import datetime, timedelta #Імпортуємо datetime та timedelta для роботи з датами
 import re #Імпортуємо re для роботи з регулярними виразами
+import sys #Імпортуємо sys для інтернування рядків, що часто повторюються
+import heapq #Імпортуємо heapq для вибору найкращих результатів пошуку
+import threading #Імпортуємо threading, щоб ледачі індекси та записи безпечно будувались під час паралельного читання
+from contextlib import nullcontext #Імпортуємо nullcontext для книги без блокування
+from .indexes import TrigramIndex, TagIndex, NoteTextIndex, BirthdayIndex, NameIndex, NameTrie, tokenize #Імпортуємо індекси для швидкого пошуку
+
+# Відновлює поле з файлу без повторної валідації (значення вже перевірене при створенні)
+def _restore_field(cls, value):
+    field = cls.__new__(cls)
+    field.value = value
+    return field
 
 class Field:
     """Базовий клас для всіх полів контактів."""
+    # __slots__ замість __dict__: поле займає лише місце під своє значення
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
     def __str__(self):
         return str(self.value)
 
+    # У файл пишеться лише значення поля
+    def __reduce__(self):
+        return _restore_field, (type(self), self.value)
+
+    # Старі файли зберігали поле як словник {"value": ...}
+    def __setstate__(self, state):
+        self.value = state["value"]
+
 class Name(Field):
     """Клас для представлення імені з валідацією формату."""
-    pass
+    __slots__ = ()
 
 class Phone(Field):
     """Клас для представлення телефонного номера з валідацією формату."""
+    __slots__ = ()
     VALID_CODES = ["050", "066", "067", "068", "095", "096", "097", "098", "099", "063", "073", "093"]
 
     def __init__(self, value):
@@ -27,6 +50,8 @@ class Phone(Field):
 
 class Birthday(Field):
     """Клас для представлення дати народження з валідацією формату."""
+    __slots__ = ()
+
     def __init__(self, value):
         try:
             birthday_date = datetime.strptime(value, "%d.%m.%Y").date()
@@ -40,10 +65,16 @@ class Birthday(Field):
 
 class Address(Field):
     """Клас для представлення адреси з валідацією формату."""
-    pass
+    __slots__ = ()
+
+    # Однакові адреси (місто, вулиця) зберігаються в пам'яті одним рядком
+    def __init__(self, value):
+        super().__init__(sys.intern(value))
 
 class Email(Field):
     """Клас для представлення електронної пошти з валідацією формату."""
+    __slots__ = ()
+
     def __init__(self, value):
         if not self.validate_email(value):
             raise ValueError("😓 Invalid email format. Please use name@example.com")
@@ -54,8 +85,18 @@ class Email(Field):
         pattern = r"^[\w\.-]+@[\w\.-]+\.\w+$"
         return re.match(pattern, value) is not None
 
+# Відновлює нотатку з файлу; теги інтернуються, бо повторюються в багатьох нотатках
+def _restore_note(text, tags):
+    note = Note.__new__(Note)
+    note.text = text
+    note.tags = tuple(sys.intern(tag) for tag in tags)
+    note._record = None
+    return note
+
 class Note(Field):
     """Клас для представлення нотатки з можливістю додавання тегів."""
+    # Теги зберігаються кортежем: він значно менший за множину, а тегів у нотатці небагато
+    __slots__ = ("text", "tags", "_record")
     
     #Валідація тегів: 1-30 символів, лише літери, цифри та підкреслення
     TAG_PATTERN = re.compile(r"^[a-zA-Z0-9_]{1,30}$")
@@ -63,20 +104,53 @@ class Note(Field):
     # Конструктор для ініціалізації тексту нотатки та тегів
     def __init__(self, text, tags=None):
         self.text = text.strip()
-        self.tags = set()
+        self.tags = ()
+        # Запис, якому належить нотатка (встановлюється Record)
+        self._record = None
         for tag in (tags or []):
             self.add_tag(tag)
 
+    # Посилання на запис не зберігається разом із нотаткою
+    def __reduce__(self):
+        return _restore_note, (self.text, self.tags)
+
+    # Старі файли зберігали нотатку як словник із множиною тегів
+    def __setstate__(self, state):
+        self.text = state["text"]
+        self.tags = tuple(sys.intern(tag) for tag in state["tags"])
+        self._record = None
+
+    # Метод для повідомлення запису про зміну нотатки
+    def _changed(self):
+        if self._record is not None:
+            self._record._changed()
+
     # Метод для додавання тегу до нотатки
     def add_tag(self, tag):
         tag_clean = tag.lstrip("#").lower()
         if not self.TAG_PATTERN.fullmatch(tag_clean):
             raise ValueError(f"😓 Invalid tag: '{tag}'. Only letters, digits, and underscores are allowed (1–30 chars).")
-        self.tags.add(tag_clean)
+        if tag_clean not in self.tags:
+            self.tags += (sys.intern(tag_clean),)
+        self._changed()
 
     # Метод для видалення тегу з нотатки
     def remove_tag(self, tag):
-        self.tags.discard(tag.lstrip("#").lower())
+        tag_clean = tag.lstrip("#").lower()
+        self.tags = tuple(t for t in self.tags if t != tag_clean)
+        self._changed()
+
+    # Метод для видалення всіх тегів нотатки
+    def clear_tags(self):
+        self.tags = ()
+        self._changed()
+
+    # Метод для заміни всіх тегів нотатки
+    def set_tags(self, tags):
+        self.tags = ()
+        for tag in tags:
+            self.add_tag(tag)
+        self._changed()
 
     # Метод для перевірки наявності тегу в нотатці
     def has_tag(self, tag):
@@ -89,11 +163,13 @@ class Note(Field):
 
     # Метод для порівняння двох нотаток
     def __eq__(self, other):
-        return isinstance(other, Note) and self.text == other.text and self.tags == other.tags
+        return isinstance(other, Note) and self.text == other.text and set(self.tags) == set(other.tags)
 
 
 class Record:
     """Клас для представлення запису в адресній книзі."""
+    __slots__ = ("name", "phones", "birthday", "address", "email", "notes", "_book")
+
     def __init__(self, name):
         self.name = Name(name)
         self.phones = []
@@ -101,7 +177,27 @@ class Record:
         self.address = None
         self.email = None
         self.notes = []
-    
+        # Адресна книга, до якої належить запис (встановлюється AddressBook)
+        self._book = None
+
+    # Посилання на книгу не зберігається разом із записом
+    def __getstate__(self):
+        return (self.name, self.phones, self.birthday, self.address, self.email, self.notes)
+
+    # Старі файли зберігали запис як словник і можуть не містити нових полів
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            state = (state["name"], state["phones"], state.get("birthday"),
+                     state.get("address"), state.get("email"), state.get("notes", []))
+        self.name, self.phones, self.birthday, self.address, self.email, self.notes = state
+        self._book = None
+        for note in self.notes:
+            note._record = self
+
+    # Метод для повідомлення адресної книги про зміну запису
+    def _changed(self):
+        if self._book is not None:
+            self._book._record_changed(self)
 
     def add_phone(self, phone, book):
         try:
@@ -110,16 +206,22 @@ class Record:
             return str(e)
         if any(p.value == phone for p in self.phones):
             return f"😓 The number '{phone}' already exists for this contact."
-        for record in book.data.values():
-            if record != self and any(p.value == phone for p in record.phones):
-                return f"😓 The number '{phone}' already belongs to '{record.name.value}'."
+        owner = book.find_by_phone(phone)
+        if owner is not None and owner is not self:
+            return f"😓 The number '{phone}' already belongs to '{owner.name.value}'."
         self.phones.append(phone_obj)
+        if self._book is not None:
+            self._book._index_phone(phone, self)
+        self._changed()
         return None
 
     def remove_phone(self, phone):
         phone_obj = self.find_phone(phone)
         if phone_obj:
             self.phones.remove(phone_obj)
+            if self._book is not None:
+                self._book._unindex_phone(phone, self)
+            self._changed()
             return True
         return False
 
@@ -130,12 +232,16 @@ class Record:
             new_phone_obj = Phone(new_phone)
         except ValueError as e:
             return str(e)
-        for record in book.data.values():
-            if record != self and any(p.value == new_phone for p in record.phones):
-                return f"😓 The new number '{new_phone}' already belongs to '{record.name.value}'."
+        owner = book.find_by_phone(new_phone)
+        if owner is not None and owner is not self:
+            return f"😓 The new number '{new_phone}' already belongs to '{owner.name.value}'."
         for i, phone in enumerate(self.phones):
             if phone.value == old_phone:
                 self.phones[i] = new_phone_obj
+                if self._book is not None:
+                    self._book._unindex_phone(old_phone, self)
+                    self._book._index_phone(new_phone, self)
+                self._changed()
                 return None
         return "😓 Something went wrong while updating the number."
 
@@ -147,27 +253,34 @@ class Record:
 
     def add_birthday(self, birthday_str):
         self.birthday = Birthday(birthday_str)
+        self._changed()
 
     def edit_birthday(self, new_birthday):
         self.birthday = Birthday(new_birthday)
+        self._changed()
 
     def remove_birthday(self):
         self.birthday = None
+        self._changed()
 
     def add_address(self, address):
         self.address = Address(address)
+        self._changed()
 
     def edit_address(self, new_address):
         if self.address:
-            self.address.value = new_address
+            self.address = Address(new_address)
+            self._changed()
         else:
             self.add_address(new_address)
 
     def remove_address(self):
         self.address = None
+        self._changed()
 
     def add_email(self, email):
         self.email = Email(email)
+        self._changed()
 
     def edit_email(self, new_email):
         if self.email:
@@ -175,11 +288,13 @@ class Record:
                 self.email = Email(new_email)
             except ValueError as e:
                 return str(e)
+            self._changed()
         else:
             return "😓 Email is not set. Use 'addemail' to add one."
 
     def remove_email(self):
         self.email = None
+        self._changed()
 
     def add_note(self, text, tags=None):
         new_note = Note(text, tags)
@@ -188,7 +303,9 @@ class Record:
             if existing_note.text.strip().lower() == new_note.text.strip().lower():
                 return None
 
+        new_note._record = self
         self.notes.append(new_note)
+        self._changed()
         return new_note
 
     def remove_note(self, text):
@@ -196,9 +313,14 @@ class Record:
         for note in self.notes:
             if note.text.strip().lower() == normalized_input:
                 self.notes.remove(note)
+                self._changed()
                 return "✅ Note removed!"
         return "😓 Note not found."
 
+    def clear_notes(self):
+        self.notes.clear()
+        self._changed()
+
     def edit_note(self, old_text, new_text):
         normalized_old = old_text.strip().lower()
         cleaned_new_text = re.sub(r"#\w+", "", new_text).strip()
@@ -206,7 +328,10 @@ class Record:
 
         for i, note in enumerate(self.notes):
             if note.text.strip().lower() == normalized_old:
-                self.notes[i] = Note(cleaned_new_text, new_tags)
+                new_note = Note(cleaned_new_text, new_tags)
+                new_note._record = self
+                self.notes[i] = new_note
+                self._changed()
                 return "✅ Note edited!"
         return "😓 Note not found."
     
@@ -221,33 +346,407 @@ class Record:
         notes_str = f", Notes: {'; '.join(str(note) for note in self.notes)}" if self.notes else ""
         return f"👤 {self.name.value}: {phones_str}{birthday_str}{email_str}{address_str}{notes_str}"
 
+# Створює запис із уже перевірених значень (зі сховища) без повторної валідації.
+# notes - пари (текст, теги).
+def restore_record(name, phones=(), birthday=None, address=None, email=None, notes=()):
+    record = Record.__new__(Record)
+    record.__setstate__((
+        _restore_field(Name, name),
+        [_restore_field(Phone, phone) for phone in phones],
+        _restore_field(Birthday, birthday) if birthday else None,
+        _restore_field(Address, sys.intern(address)) if address else None,
+        _restore_field(Email, email) if email else None,
+        [_restore_note(text, tags) for text, tags in notes],
+    ))
+    return record
+
+# Позначка запису, який ще не прочитано зі сховища
+_UNLOADED = object()
+LOAD_BATCH = 500 # Скільки записів читається зі сховища за раз під час обходу книги
+
+class LazyRecords(dict):
+    """Словник записів книги, що читає кожен запис зі сховища лише при першому зверненні.
+
+    source має методи load_record(key) та load_records(keys) (ітератор пар ключ-запис).
+    Якщо задано cache_size, у пам'яті лишається не більше стільки прочитаних і не змінених
+    записів (найдавніше використані забуваються), а обхід усіх записів іде частинами,
+    тож книга може бути більшою за оперативну пам'ять."""
+
+    def __init__(self, book, source, keys, cache_size=None):
+        super().__init__(dict.fromkeys(keys, _UNLOADED))
+        self._book = book
+        self.source = source
+        self._unloaded = set(self)
+        self.cache_size = cache_size
+        # Прочитані зі сховища записи, які можна забути, від найдавніше використаного
+        self._cached = OrderedDict()
+        # Змінені записи, яких ще немає у сховищі; після збереження вони повертаються в _cached
+        self._held = set()
+        # Читання зі сховища може йти з кількох потоків-читачів одночасно
+        self._load_lock = threading.Lock()
+
+    def _attach(self, key, record):
+        record._book = self._book
+        dict.__setitem__(self, key, record)
+        self._unloaded.discard(key)
+        if self.cache_size is not None:
+            self._cached[key] = None
+            self._evict()
+        return record
+
+    # Забуває найдавніше використані записи понад cache_size. Змінені записи лишаються
+    # в пам'яті, доки їх не збережуть (release), а потім знову стають у чергу
+    def _evict(self):
+        dirty = self._book._dirty
+        while len(self._cached) > self.cache_size:
+            key, _ = self._cached.popitem(last=False)
+            if key in dirty:
+                self._held.add(key)
+            else:
+                dict.__setitem__(self, key, _UNLOADED)
+                self._unloaded.add(key)
+
+    # Сховище записало ці ключі: їхні записи знову можна забувати. Ключі, які змінилися
+    # вже після підготовки збереження, чекають наступного
+    def release(self, keys):
+        if self.cache_size is None:
+            return
+        dirty = self._book._dirty
+        with self._load_lock:
+            for key in keys:
+                if key in self._held and key not in dirty and dict.__contains__(self, key):
+                    self._held.discard(key)
+                    self._cached[key] = None
+            self._evict()
+
+    def __getitem__(self, key):
+        record = dict.__getitem__(self, key)
+        if record is _UNLOADED:
+            with self._load_lock:
+                record = dict.__getitem__(self, key)
+                if record is _UNLOADED:
+                    record = self._attach(key, self.source.load_record(key))
+        elif self.cache_size is not None and key in self._cached:
+            try:
+                self._cached.move_to_end(key)
+            except KeyError:
+                # Інший потік щойно забув цей запис; повернений об'єкт лишається чинним
+                pass
+        return record
+
+    def __setitem__(self, key, record):
+        self._unloaded.discard(key)
+        self._hold(key)
+        dict.__setitem__(self, key, record)
+
+    def __delitem__(self, key):
+        self._unloaded.discard(key)
+        self._cached.pop(key, None)
+        self._held.discard(key)
+        dict.__delitem__(self, key)
+
+    def _hold(self, key):
+        if self.cache_size is not None:
+            self._cached.pop(key, None)
+            self._held.add(key)
+
+    # Запис змінився: до збереження він не забувається, а якщо його вже забули, поки команда
+    # тримала об'єкт, повертається в словник, щоб зміна не загубилась
+    def keep(self, key, record):
+        self._hold(key)
+        if key in self._unloaded:
+            self._unloaded.discard(key)
+            dict.__setitem__(self, key, record)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def pop(self, key, *default):
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        record = self[key]
+        del self[key]
+        return record
+
+    # Запис, якщо його вже прочитано, інакше None (щоб не читати його без потреби)
+    def loaded(self, key):
+        record = dict.__getitem__(self, key)
+        return None if record is _UNLOADED else record
+
+    # Обхід усіх записів читає решту непрочитаних одним проходом по сховищу
+    def load_all(self):
+        if self._unloaded:
+            with self._load_lock:
+                for key, record in self.source.load_records(set(self._unloaded)):
+                    if key in self._unloaded:
+                        self._attach(key, record)
+
+    # Обхід з обмеженим кешем: записи читаються частинами по LOAD_BATCH у порядку книги
+    def _iter_items(self):
+        keys = list(dict.keys(self))
+        for start in range(0, len(keys), LOAD_BATCH):
+            batch = {}
+            missing = []
+            for key in keys[start:start + LOAD_BATCH]:
+                record = dict.get(self, key)
+                if record is _UNLOADED:
+                    missing.append(key)
+                elif record is not None:
+                    batch[key] = record
+            if missing:
+                with self._load_lock:
+                    for key, record in self.source.load_records(missing):
+                        if key in self._unloaded:
+                            self._attach(key, record)
+                        batch[key] = dict.get(self, key, record)
+            for key in keys[start:start + LOAD_BATCH]:
+                if key in batch:
+                    yield key, batch[key]
+
+    def values(self):
+        if self.cache_size is not None:
+            return (record for _, record in self._iter_items())
+        self.load_all()
+        return dict.values(self)
+
+    def items(self):
+        if self.cache_size is not None:
+            return self._iter_items()
+        self.load_all()
+        return dict.items(self)
+
+    # У pickle книга потрапляє як звичайний словник уже прочитаних записів
+    def __reduce__(self):
+        return dict, (dict(self.items()),)
+
 class AddressBook(UserDict):
     """Клас для виведення адресної книги, що містить записи контактів."""
-   
+
+    # Блокування читачів і записувачів; None - книга використовується з одного потоку
+    _lock = None
+
+    def __init__(self, *args, **kwargs):
+        self._init_transient()
+        super().__init__(*args, **kwargs)
+
+    def _init_transient(self):
+        # Індекс імен: ім'я в нижньому регістрі -> ключі записів у порядку додавання
+        self._names = {}
+        # Індекс телефонів: номер -> ключ запису, якому він належить
+        self._phones = {}
+        # Порядковий номер кожного ключа, щоб результати індексів ішли в порядку книги
+        self._order = {}
+        self._next_order = 0
+        # Додаткові індекси (indexes.py), які будуються лише при першому використанні
+        self._indexes = {}
+        # Перша побудова індексу може статися в кількох читачів одночасно
+        self._index_lock = threading.Lock()
+        # Змінені з останнього збереження ключі: "add" (новий), "set" (змінений) або "del"
+        self._dirty = {}
+        # Файл, з яким книга синхронізована (для журналу змін у storage.py)
+        self._synced_file = None
+
+    # Методи словника оновлюють індекси, тож будь-яка зміна книги їх підтримує
+    def __setitem__(self, key, record):
+        if key in self.data:
+            self._unindex_record(key, self.data[key])
+            self._mark_dirty(key, "set")
+        else:
+            self._names.setdefault(key.lower(), []).append(key)
+            self._order[key] = self._next_order
+            self._next_order += 1
+            self._dirty[key] = "add"
+        self.data[key] = record
+        record._book = self
+        # Новий стан запису - найсвіжіший, тож його номери перезаписують застарілих власників
+        # (журнал відтворює записи не в тому порядку, в якому вони змінювались)
+        for phone in record.phones:
+            self._phones[phone.value] = key
+        for index in self._indexes.values():
+            index.update(key, record)
+
+    def __delitem__(self, key):
+        record = self.data.pop(key)
+        self._unindex_record(key, record)
+        record._book = None
+        keys = self._names[key.lower()]
+        keys.remove(key)
+        if not keys:
+            del self._names[key.lower()]
+        del self._order[key]
+        for index in self._indexes.values():
+            index.remove(key)
+        self._dirty[key] = "del"
+
+    def _mark_dirty(self, key, op):
+        if self._dirty.get(key) != "add":
+            self._dirty[key] = op
+
+    def _record_changed(self, record):
+        key = record.name.value
+        self._mark_dirty(key, "set")
+        if isinstance(self.data, LazyRecords):
+            self.data.keep(key, record)
+        for index in self._indexes.values():
+            index.update(key, record)
+
+    # Повертає індекс заданого класу, будуючи його з усіх записів при першому зверненні
+    def _get_index(self, index_class):
+        index = self._indexes.get(index_class)
+        if index is None:
+            with self._index_lock:
+                index = self._indexes.get(index_class)
+                if index is None:
+                    index = index_class()
+                    index.build(((key, None) for key in self.data) if index_class.from_keys else self.data.items())
+                    self._indexes[index_class] = index
+        return index
+
+    # Вмикає режим для багатопотокових програм: команди з реєстру читають книгу паралельно,
+    # а кожна зміна (разом з усіма її кроками) виконується під блокуванням запису.
+    # Код, що працює з книгою напряму, має обгортати звернення в reading() або writing().
+    def enable_locking(self):
+        if self._lock is None:
+            from .rwlock import RWLock
+            self._lock = RWLock()
+        return self
+
+    def reading(self):
+        return self._lock.read() if self._lock is not None else nullcontext()
+
+    def writing(self):
+        return self._lock.write() if self._lock is not None else nullcontext()
+
+    # Замінює вміст книги вмістом other (повне перечитування файлу іншим процесом),
+    # зберігаючи сам об'єкт книги, на який посилаються команди, блокування і зберігач
+    def _replace_contents(self, other):
+        self.data = other.data
+        if isinstance(self.data, LazyRecords):
+            self.data._book = self
+        for record in dict.values(self.data):
+            if record is not _UNLOADED:
+                record._book = self
+        self._names = other._names
+        self._phones = other._phones
+        self._order = other._order
+        self._next_order = other._next_order
+        self._indexes = {}
+        self._dirty = {}
+        self._synced_file = other._synced_file
+
+    # Записи за ключами у тому порядку, в якому вони йдуть у книзі
+    def _records_in_order(self, keys):
+        return [self.data[key] for key in sorted(keys, key=self._order.__getitem__)]
+
+    def _unindex_record(self, key, record):
+        for phone in record.phones:
+            if self._phones.get(phone.value) == key:
+                del self._phones[phone.value]
+
+    def _index_phone(self, phone, record):
+        self._phones[phone] = record.name.value
+
+    def _unindex_phone(self, phone, record):
+        if self._phones.get(phone) == record.name.value:
+            del self._phones[phone]
+
+    # Індекси та стан збереження не пишуться у файл, а відновлюються після завантаження
+    def __getstate__(self):
+        return {"data": self.data}
+
+    def __setstate__(self, state):
+        self.data = state["data"]
+        self._init_transient()
+        self._rebuild_index()
+
+    def _rebuild_index(self):
+        for key, record in self.data.items():
+            self._names.setdefault(key.lower(), []).append(key)
+            self._order[key] = self._next_order
+            self._next_order += 1
+            record._book = self
+            for phone in record.phones:
+                self._phones.setdefault(phone.value, key)
+
+    # Книга, записи якої читаються зі сховища source лише при першому зверненні.
+    # keys - ключі у порядку книги, phones - пари (номер, ключ) для пошуку за телефоном,
+    # cache_size - скільки прочитаних записів тримати в пам'яті (None - усі).
+    @classmethod
+    def from_source(cls, source, keys, phones=(), cache_size=None):
+        book = cls()
+        book.data = LazyRecords(book, source, keys, cache_size)
+        names = book._names
+        for key in book.data:
+            names.setdefault(key.lower(), []).append(key)
+        book._order = dict(zip(book.data, range(len(book.data))))
+        book._next_order = len(book._order)
+        # Якщо номер трапляється кілька разів, він належить першому запису, як і в _rebuild_index
+        book._phones = dict(reversed(list(phones)))
+        return book
+
+    # Обхід іде через словник записів, щоб непрочитані записи читалися зі сховища разом
+    def values(self):
+        return self.data.values()
+
+    def items(self):
+        return self.data.items()
+
+    def _find_key(self, name):
+        keys = self._names.get(name.lower())
+        return keys[0] if keys else None
+
     def add_record(self, record):
-        self.data[record.name.value] = record
+        self[record.name.value] = record
         
     def find(self, name):
-        name = name.lower()
-        for key, record in self.data.items():
-            if key.lower() == name:
-                return record
-        return None
+        key = self._find_key(name)
+        return self.data[key] if key is not None else None
 
     def name_exists(self, name):
-        return any(name.lower() == key.lower() for key in self.data)
+        return name.lower() in self._names
+
+    # Ключі контактів, в імені яких є name (без урахування регістру), у порядку книги
+    def find_partial(self, name):
+        query = name.lower()
+        candidates = self._get_index(NameIndex).substring_candidates(query)
+        keys = self.data if candidates is None else sorted(candidates, key=self._order.__getitem__)
+        return [key for key in keys if query in key.lower()]
+
+    # Ділить аргументи команди на ім'я і решту: ім'я - найдовший початок args, що належить
+    # контакту, і після нього лишається щонайменше rest аргументів.
+    # Повертає (ключ контакту, кількість слів імені) або (None, 0)
+    def split_name(self, args, rest=1):
+        count, key = self._get_index(NameTrie).longest_prefix(args, max(len(args) - rest, 0))
+        return key, count
+
+    # До limit імен, що починаються з prefix, для доповнення за Tab
+    def complete_names(self, prefix, limit=100):
+        return self._get_index(NameTrie).complete(prefix, limit)
+
+    # Імена, схожі на name з урахуванням описок, для підказки "did you mean"
+    def similar_names(self, name, limit=5):
+        return self._get_index(NameIndex).similar(name, self._order, limit)
+
+    def find_by_phone(self, phone):
+        key = self._phones.get(phone)
+        return self.data[key] if key is not None else None
 
     def delete(self, name):
-        for key in list(self.data):
-            if key.lower() == name.lower():
-                del self.data[key]
-                return True
-        return False
+        key = self._find_key(name)
+        if key is None:
+            return False
+        del self[key]
+        return True
 
+    # Триграмний індекс звужує пошук до кандидатів, які потім перевіряються повністю
     def search(self, query):
         result = []
         query = query.lower()
-        for record in self.data.values():
+        candidates = self._get_index(TrigramIndex).candidates(query)
+        records = self.data.values() if candidates is None else self._records_in_order(candidates)
+        for record in records:
             name_match = query in record.name.value.lower()
             phone_match = any(query in phone.value for phone in record.phones)
             email_match = record.email and query in record.email.value.lower()
@@ -257,27 +756,93 @@ class AddressBook(UserDict):
                 result.append(str(record))
         return result
     
+    # Нотатки з тегом tag (або з будь-яким тегом, що починається з prefix) у порядку книги
+    def notes_by_tag(self, tag, prefix=False):
+        index = self._get_index(TagIndex)
+        tag = tag.lstrip("#").lower()
+        tags = index.prefix_terms(tag) if prefix else [tag]
+        keys = set()
+        for term in tags:
+            keys |= index.lookup(term)
+        tags = set(tags)
+        result = []
+        for record in self._records_in_order(keys):
+            for note in record.notes:
+                if tags.intersection(note.tags):
+                    result.append((record, note))
+        return result
+
+    # Усі теги за алфавітом разом із їхніми нотатками
+    def notes_grouped_by_tag(self):
+        index = self._get_index(TagIndex)
+        for tag in index.sorted_terms():
+            yield tag, self.notes_by_tag(tag)
+
+    # Нотатки, що містять усі слова запиту (як префікси слів), від найрелевантніших за BM25
+    def search_notes(self, query, limit=10):
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+        index = self._get_index(NoteTextIndex)
+        scored = []
+        for record in self._records_in_order(index.candidates(query_tokens)):
+            name_tokens = tokenize(record.name.value)
+            for note in record.notes:
+                score = index.score(tokenize(note.text) + name_tokens, query_tokens)
+                if score is not None:
+                    scored.append((-score, len(scored), record, note))
+        return [(record, note) for _, _, record, note in heapq.nsmallest(limit, scored)]
+
+    # Ключі записів для перегляду: у порядку книги або за ім'ям, за потреби лише з тегом tag
+    # у нотатках, з днем народження в місяці month і/або з ім'ям, що починається з prefix.
+    # Самі записи при цьому не читаються.
+    def select_keys(self, sort_by_name=False, tag=None, month=None, prefix=None):
+        keys = None
+        if tag is not None:
+            keys = set(self._get_index(TagIndex).lookup(tag.lstrip("#").lower()))
+        if month is not None:
+            month_keys = self._get_index(BirthdayIndex).keys_in_month(month)
+            keys = month_keys if keys is None else keys & month_keys
+        if prefix is not None:
+            prefix_keys = set(self._get_index(NameTrie).complete(prefix, limit=None))
+            keys = prefix_keys if keys is None else keys & prefix_keys
+        if keys is None:
+            keys = self.data
+        if sort_by_name:
+            return sorted(keys, key=lambda key: (key.lower(), key))
+        return sorted(keys, key=self._order.__getitem__) if keys is not self.data else list(keys)
+
+    # Дні народження між start і end (включно) у календарному порядку: пари (запис, дата)
+    def birthdays_between(self, start, end):
+        hits = self._get_index(BirthdayIndex).between(start, end)
+        hits.sort(key=lambda hit: (hit[0], self._order[hit[1]]))
+        return [(self.data[key], birthday_date) for birthday_date, key in hits]
+
+    # Дата привітання: день народження, що випав на вихідні, переноситься на понеділок
+    @staticmethod
+    def congratulation_date(birthday_date):
+        if birthday_date.weekday() == 5:
+            return birthday_date + timedelta(days=2)
+        if birthday_date.weekday() == 6:
+            return birthday_date + timedelta(days=1)
+        return birthday_date
+
     def get_upcoming_birthdays(self, days=7):
         today = datetime.today().date()
-        end_date = today + timedelta(days=days)
-        upcoming = []
-        for record in self.data.values():
-            if not record.birthday:
-                continue
-            try:
-                birthday_date = datetime.strptime(record.birthday.value, "%d.%m.%Y").date()
-                birthday_this_year = birthday_date.replace(year=today.year)
-                if birthday_this_year < today:
-                    birthday_this_year = birthday_this_year.replace(year=today.year + 1)
-                if today <= birthday_this_year <= end_date:
-                    congratulation_date = birthday_this_year
-                    if congratulation_date.weekday() == 5:
-                        congratulation_date += timedelta(days=2)
-                    elif congratulation_date.weekday() == 6:
-                        congratulation_date += timedelta(days=1)
-                    upcoming.append(f"{record.name.value}: {congratulation_date.strftime('%d.%m.%Y')}")
-            except ValueError:
-                continue
-        return upcoming
+        # Для вікна "наступні N днів" показуємо лише найближчий день народження кожного контакту
+        return self._format_birthdays(self.birthdays_between(today, today + timedelta(days=days)), unique=True)
 
+    def get_birthdays_between(self, start, end):
+        return self._format_birthdays(self.birthdays_between(start, end))
 
+    def _format_birthdays(self, birthdays, unique=False):
+        upcoming = []
+        seen = set()
+        for record, birthday_date in birthdays:
+            if unique:
+                if record.name.value in seen:
+                    continue
+                seen.add(record.name.value)
+            congratulation_date = self.congratulation_date(birthday_date)
+            upcoming.append(f"{record.name.value}: {congratulation_date.strftime('%d.%m.%Y')}")
+        return upcoming
@@ -0,0 +1,65 @@
+import socket # Імпортуємо socket для з'єднання з сервером адресної книги
+from .server import parse_address # Імпортуємо parse_address, щоб клієнт і сервер розуміли адресу однаково
+
+# Стиль rich для кожного статусу відповіді сервера
+STYLES = {"OK": "green", "CHANGED": "green", "ERROR": "yellow", "BYE": "green"}
+
+
+class BookClient:
+    """Клієнт протоколу сервера: надсилає рядок команди і читає відповідь (статус, текст)."""
+
+    def __init__(self, address):
+        kind, target = parse_address(address)
+        if kind == "unix":
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(target)
+        else:
+            self._socket = socket.create_connection(target)
+        self._file = self._socket.makefile("rw", encoding="utf-8", newline="\n")
+
+    def send(self, line):
+        self._file.write(line.replace("\n", " ") + "\n")
+        self._file.flush()
+        header = self._file.readline()
+        if not header:
+            raise ConnectionError("the server closed the connection")
+        status, count = header.split()
+        lines = [self._file.readline().rstrip("\n") for _ in range(int(count))]
+        return status, "\n".join(lines)
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+
+# Інтерактивний режим, як у main.interactive, але команди виконує сервер
+def run_client(address):
+    from rich.console import Console
+    console = Console()
+    try:
+        client = BookClient(address)
+    except (OSError, ValueError) as e:
+        console.print(f"😓 Cannot connect to the server at {address}: {e}", style="red")
+        return 1
+    try:
+        console.print(f"😊 Welcome to the assistant bot! Connected to {address}.", style="green")
+        console.print(f"Upcoming Birthdays:\n{client.send('upcomingbdays')[1]}", style="yellow")
+        console.print("\nType 'help' to see available commands.", style="blue")
+        while True:
+            user_input = input("Enter a command: ")
+            if not user_input.strip():
+                console.print("😓 You didn’t enter anything! Please try again.", style="yellow")
+                continue
+            status, result = client.send(user_input.strip())
+            if result:
+                console.print(result, style=STYLES.get(status, "green"))
+            if status == "BYE":
+                break
+    except (KeyboardInterrupt, EOFError):
+        console.print("\n👋 Good bye!", style="green")
+    except ConnectionError as e:
+        console.print(f"😓 Connection lost: {e}", style="red")
+        return 1
+    finally:
+        client.close()
+    return 0
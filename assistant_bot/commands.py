@@ -1,9 +1,14 @@
 from .book import Field, Record, Phone, Birthday, Email, Address, Name, Note, AddressBook
-from .utils import normalize_name, format_address, extract_tags_from_text
+from .utils import normalize_name, format_address, extract_tags_from_text, split_options
 from .decorators import input_error
 from datetime import datetime
 import re
 
+MAX_UPCOMING_DAYS = 366
+
+def hello(args, book, command="hello"):
+    return "😊 How can I help you?"
+
 @input_error
 def add_contact(args, book, command="addcontact"):
     if len(args) < 2:
@@ -62,14 +67,10 @@ def add_contact(args, book, command="addcontact"):
 def edit_contact_name(args, book, command="editname"):
     if len(args) < 2:
         raise IndexError
-    for i in range(1, len(args)):
-        old_name_try = normalize_name(" ".join(args[:i]))
-        if book.name_exists(old_name_try):
-            old_name = old_name_try
-            new_name = normalize_name(" ".join(args[i:]))
-            break
-    else:
+    old_name, i = book.split_name(args)
+    if old_name is None:
         raise KeyError
+    new_name = normalize_name(" ".join(args[i:]))
     record = book.find(old_name)
     book.delete(old_name)
     record.name = Name(new_name)
@@ -85,7 +86,7 @@ def change_contact(args, book, command="changephone"):
     name = normalize_name(" ".join(args[:-2]))
     record = book.find(name)
     if not record:
-        raise KeyError
+        raise KeyError(name)
     result = record.edit_phone(old_phone, new_phone, book)
     if result:
         return result
@@ -99,7 +100,7 @@ def add_phone_to_contact(args, book, command="addphone"):
     name = normalize_name(" ".join(args[:-1]))
     record = book.find(name)
     if not record:
-        raise KeyError
+        raise KeyError(name)
     result = record.add_phone(possible_phone, book)
     if result:
         return result
@@ -113,7 +114,7 @@ def remove_phone(args, book, command="removephone"):
     name = normalize_name(" ".join(args[:-1]))
     record = book.find(name)
     if not record:
-        raise KeyError
+        raise KeyError(name)
     if not record.remove_phone(possible_phone):
         return f"😓 Phone number '{possible_phone}' not found."
     return "✅ Phone number removed!"
@@ -124,7 +125,7 @@ def remove_contact(args, book, command="removecontact"):
         raise IndexError
     name = normalize_name(" ".join(args))
     if not book.delete(name):
-        raise KeyError
+        raise KeyError(name)
     return f"✅ Contact '{name}' removed!"
 
 @input_error
@@ -139,7 +140,7 @@ def add_birthday(args, book, command="addbday"):
         return "😓 Invalid date format. Use DD.MM.YYYY, for example, 15.05.1990."
     record = book.find(name)
     if not record:
-        raise KeyError
+        raise KeyError(name)
     if record.birthday:
         return "😓 Birthday is already set. Use ‘editbday’ to change it."
     record.add_birthday(birthday)
@@ -150,9 +151,9 @@ def show_birthday(args, book, command="showbday"):
     if not args:
         raise IndexError
     name = normalize_name(" ".join(args))
-    matches = [record for key, record in book.data.items() if name.lower() in key.lower()]
+    matches = [book.data[key] for key in book.find_partial(name)]
     if not matches:
-        raise KeyError
+        raise KeyError(name)
     if len(matches) == 1:
         record = matches[0]
         if record.birthday:
@@ -175,7 +176,7 @@ def edit_birthday(args, book, command="editbday"):
     birthday = args[-1]
     record = book.find(name)
     if not record:
-        raise KeyError
+        raise KeyError(name)
     record.edit_birthday(birthday)
     return "✅ Birthday updated!"
 
@@ -186,7 +187,7 @@ def remove_birthday(args, book, command="removebday"):
     name = normalize_name(" ".join(args))
     record = book.find(name)
     if not record:
-        raise KeyError
+        raise KeyError(name)
     record.remove_birthday()
     return "✅ Birthday removed!"
 
@@ -200,15 +201,13 @@ def show_phone(args, book, command="showphone"):
     
     matches = []
     if len(digits_only) == 10:
-        matches = [
-            record for record in book.data.values()
-            if any(phone.value == digits_only for phone in record.phones)
-        ]
+        record = book.find_by_phone(digits_only)
+        matches = [record] if record else []
     else:
         name = normalize_name(" ".join(args))
-        matches = [record for key, record in book.data.items() if name.lower() in key.lower()]
+        matches = [book.data[key] for key in book.find_partial(name)]
     if not matches:
-        raise KeyError
+        raise KeyError(name if len(digits_only) != 10 else None)
     if len(matches) == 1:
         record = matches[0]
         return f"{record.name.value}: {', '.join(p.value for p in record.phones)}"
@@ -242,23 +241,38 @@ def search_contacts(args, book, command="search"):
 
 @input_error
 def upcoming_birthdays(args, book, command="upcomingbdays"):
-    if args:
-        raise IndexError
-    upcoming = book.get_upcoming_birthdays()
-    return "\n".join(upcoming) if upcoming else "🎂 No upcoming birthdays in the next 7 days."
+    if not args:
+        upcoming = book.get_upcoming_birthdays()
+        return "\n".join(upcoming) if upcoming else "🎂 No upcoming birthdays in the next 7 days."
+    if len(args) == 1:
+        if not args[0].isdigit():
+            raise IndexError
+        days = int(args[0])
+        # Індекс днів народження календарний, тож довше за рік вікно нічого нового не покаже
+        if days > MAX_UPCOMING_DAYS:
+            return f"😓 The number of days must be from 0 to {MAX_UPCOMING_DAYS}, for example: 'upcomingbdays 30'."
+        upcoming = book.get_upcoming_birthdays(days)
+        return "\n".join(upcoming) if upcoming else f"🎂 No upcoming birthdays in the next {days} days."
+    if len(args) == 2:
+        try:
+            start = datetime.strptime(args[0], "%d.%m.%Y").date()
+            end = datetime.strptime(args[1], "%d.%m.%Y").date()
+        except ValueError:
+            return "😓 Invalid date format. Use DD.MM.YYYY, for example, 'upcomingbdays 01.06.2025 30.06.2025'."
+        if start > end:
+            return "😓 The start date must not be after the end date."
+        upcoming = book.get_birthdays_between(start, end)
+        return "\n".join(upcoming) if upcoming else f"🎂 No birthdays between {args[0]} and {args[1]}."
+    raise IndexError
 
 @input_error
 def add_address(args, book, command="addaddress"):
     if len(args) < 2:
         raise IndexError
-    for i in range(1, len(args)):
-        possible_name = normalize_name(" ".join(args[:i]))
-        if book.name_exists(possible_name):
-            name = possible_name
-            address = " ".join(args[i:]).title()
-            break
-    else:
+    name, i = book.split_name(args)
+    if name is None:
         return "😓 Contact not found."
+    address = " ".join(args[i:]).title()
     record = book.find(name)
     if record.address:
         return "😓 Address already exists. Use ‘editaddress’ to change it."
@@ -269,14 +283,10 @@ def add_address(args, book, command="addaddress"):
 def edit_address(args, book, command="editaddress"):
     if len(args) < 2:
         raise IndexError
-    for i in range(1, len(args)):
-        possible_name = normalize_name(" ".join(args[:i]))
-        if book.name_exists(possible_name):
-            name = possible_name
-            new_address = " ".join(args[i:]).title()
-            break
-    else:
+    name, i = book.split_name(args)
+    if name is None:
         return "😓 Contact not found."
+    new_address = " ".join(args[i:]).title()
     record = book.find(name)
     record.edit_address(new_address)
     return "✅ Address updated!"
@@ -288,7 +298,7 @@ def remove_address(args, book, command="removeaddress"):
     name = normalize_name(" ".join(args))
     record = book.find(name)
     if not record:
-        raise KeyError
+        raise KeyError(name)
     if not record.address:
         return "😓 Address is not set."
     record.remove_address()
@@ -298,14 +308,10 @@ def remove_address(args, book, command="removeaddress"):
 def add_email(args, book, command="addemail"):
     if len(args) < 2:
         raise IndexError
-    for i in range(1, len(args)):
-        possible_name = normalize_name(" ".join(args[:i]))
-        if book.name_exists(possible_name):
-            name = possible_name
-            email = " ".join(args[i:])
-            break
-    else:
+    name, i = book.split_name(args)
+    if name is None:
         return "😓 Contact not found."
+    email = " ".join(args[i:])
     record = book.find(name)
     if record.email:
         return "😓 Email already exists. Use ‘editemail’ to change it."
@@ -316,14 +322,10 @@ def add_email(args, book, command="addemail"):
 def edit_email(args, book, command="editemail"):
     if len(args) < 2:
         raise IndexError
-    for i in range(1, len(args)):
-        possible_name = normalize_name(" ".join(args[:i]))
-        if book.name_exists(possible_name):
-            name = possible_name
-            new_email = " ".join(args[i:])
-            break
-    else:
+    name, i = book.split_name(args)
+    if name is None:
         return "😓 Contact not found."
+    new_email = " ".join(args[i:])
     record = book.find(name)
     result = record.edit_email(new_email)
     if result is not None:
@@ -335,12 +337,8 @@ def edit_email(args, book, command="editemail"):
 def remove_email(args, book, command="removeemail"):
     if not args:
         raise IndexError
-    for i in range(1, len(args) + 1):
-        possible_name = normalize_name(" ".join(args[:i]))
-        if book.name_exists(possible_name):
-            name = possible_name
-            break
-    else:
+    name, _ = book.split_name(args, rest=0)
+    if name is None:
         return "😓 Please provide a valid contact name."
 
     record = book.find(name)
@@ -358,14 +356,10 @@ def add_note(args, book, command="addnote"):
     if len(args) < 2:
         raise IndexError
 
-    for i in range(1, len(args)):
-        name_try = normalize_name(" ".join(args[:i]))
-        if book.name_exists(name_try):
-            name = name_try
-            note_text = " ".join(args[i:])
-            break
-    else:
+    name, i = book.split_name(args)
+    if name is None:
         return "😓 Contact not found."
+    note_text = " ".join(args[i:])
 
     tags = extract_tags_from_text(note_text)
     clean_text = re.sub(r"#\w+", "", note_text).strip()
@@ -382,12 +376,8 @@ def edit_note(args, book, command="editnote"):
     if len(args) < 3:
         raise IndexError
 
-    for i in range(1, len(args)):
-        name_try = normalize_name(" ".join(args[:i]))
-        if book.name_exists(name_try):
-            name = name_try
-            break
-    else:
+    name, i = book.split_name(args)
+    if name is None:
         return "😓 Please provide the contact name, old note text and new note text."
 
     record = book.find(name)
@@ -414,7 +404,7 @@ def edit_note(args, book, command="editnote"):
         for note in record.notes:
             if note.text.strip().lower() == clean_new_text.lower():
                 if tags:
-                    note.tags = set(tags)
+                    note.set_tags(tags)
         return f"✅ Note updated{' with tags: ' + ', '.join(tags) if tags else ''}"
     return result
     
@@ -423,52 +413,43 @@ def remove_note(args, book, command="removenote"):
     if not args:
         raise IndexError
 
-    for i in range(1, len(args) + 1):
-        possible_name = normalize_name(" ".join(args[:i]))
-        if book.name_exists(possible_name):
-            name = possible_name
-            record = book.find(name)
-            note_text = " ".join(args[i:]).strip()
-
-            if not note_text:
-                if not record.notes:
-                    return f"ℹ️ No notes to remove for '{name}'."
-                record.notes.clear()
-                return f"🗑️ All notes removed for '{name}'."
-
-            if record.remove_note(note_text):
-                return "✅ Note removed!"
-            else:
-                return "😓 Note not found."
-    return "🤔 Please provide the contact name and note text to remove."
+    name, i = book.split_name(args, rest=0)
+    if name is None:
+        return "🤔 Please provide the contact name and note text to remove."
+    record = book.find(name)
+    note_text = " ".join(args[i:]).strip()
+
+    if not note_text:
+        if not record.notes:
+            return f"ℹ️ No notes to remove for '{name}'."
+        record.clear_notes()
+        return f"🗑️ All notes removed for '{name}'."
+
+    if record.remove_note(note_text):
+        return "✅ Note removed!"
+    else:
+        return "😓 Note not found."
 
 @input_error
 def search_note(args, book, command="searchnote"):
+    args, options = split_options(args)
     if not args:
         raise IndexError
+    limit = options.get("limit", "10")
+    if not limit.isdigit() or int(limit) < 1:
+        return "😓 The limit must be a positive number, for example: 'searchnote meeting --limit 5'."
+    limit = int(limit)
 
-    query = " ".join(args).lower()
-    matches = set()
-
-    for record in book.values():
-        name_match = query in record.name.value.lower()
-        for note in record.notes:
-            note_match = query in note.text.lower()
-            if name_match or note_match:
-                matches.add(f"{record.name.value}: {note}")
-
+    matches = [f"{record.name.value}: {note}" for record, note in book.search_notes(" ".join(args), limit)]
     return "\n".join(matches) if matches else "😓 No notes found."
 
 @input_error
 def add_tag_to_note(args, book, command="addtag"):
     if len(args) < 3:
         raise IndexError
-    for i in range(1, len(args) - 1):
-        name_try = normalize_name(" ".join(args[:i]))
-        if book.name_exists(name_try):
-            name = name_try
-            break
-    else:
+    # Після імені мають лишитися текст нотатки і тег
+    name, i = book.split_name(args, rest=2)
+    if name is None:
         return "📝 Please provide the contact name, note text and tag to add."
 
     record = book.find(name)
@@ -492,14 +473,10 @@ def remove_tag_from_note(args, book, command="removetag"):
     if len(args) < 2:
         raise IndexError
 
-    for i in range(1, len(args) + 1):
-        name_try = normalize_name(" ".join(args[:i]))
-        if book.name_exists(name_try):
-            name = name_try
-            rest_args = args[i:]
-            break
-    else:
+    name, i = book.split_name(args, rest=0)
+    if name is None:
         return "😓 Please provide the contact name, note text and a tag to remove."
+    rest_args = args[i:]
 
     if not rest_args:
         return "😓 Please provide the note text and a tag to remove."
@@ -515,13 +492,13 @@ def remove_tag_from_note(args, book, command="removetag"):
         if note.text.strip().lower() == note_text.lower():
             if tag_to_remove:
                 if tag_to_remove in note.tags:
-                    note.tags.remove(tag_to_remove)
+                    note.remove_tag(tag_to_remove)
                     return f"🗑️ Tag '#{tag_to_remove}' removed from note: '{note.text}'"
                 else:
                     return f"😓 Tag '#{tag_to_remove}' not found in this note."
             else:
                 if note.tags:
-                    note.tags.clear()
+                    note.clear_tags()
                     return f"🗑️ All tags removed from note: '{note.text}'"
                 else:
                     return f"ℹ️ This note has no tags."
@@ -532,33 +509,26 @@ def search_note_by_tag(args, book, command="searchtag"):
     if not args:
         raise IndexError
     tag = args[0].lstrip("#").lower()
-    matches = []
-    for record in book.values():
-        for note in record.notes:
-            if note.has_tag(tag):
-                matches.append(f"{record.name.value}: {note}")
-    return "\n".join(matches) if matches else f"😓 No notes with tag '#{tag}' found."
+    # Тег із зірочкою в кінці (#proj*) шукає всі теги з таким префіксом
+    prefix = tag.endswith("*")
+    tag = tag.rstrip("*")
+    if not tag:
+        raise IndexError
+    matches = [f"{record.name.value}: {note}" for record, note in book.notes_by_tag(tag, prefix=prefix)]
+    tag_label = f"#{tag}*" if prefix else f"#{tag}"
+    return "\n".join(matches) if matches else f"😓 No notes with tag '{tag_label}' found."
 
 
 @input_error
 def sort_note_by_tag(args, book, command="sorttag"):
-    tag_map = {}
-
-    for record in book.values():
-        for note in record.notes:
-            for tag in note.tags:
-                tag = tag.lower()
-                tag_map.setdefault(tag, []).append((record.name.value, note))
-
-    if not tag_map:
-        return "😓 No tagged notes to sort."
-
     result_lines = []
-    for tag in sorted(tag_map):
+    for tag, notes in book.notes_grouped_by_tag():
         result_lines.append(f"📌 #{tag}")
-        for name, note in tag_map[tag]:
-            result_lines.append(f"{name}: {note}")
+        for record, note in notes:
+            result_lines.append(f"{record.name.value}: {note}")
         result_lines.append("")  # empty line for spacing
 
-    return "\n".join(result_lines)
+    if not result_lines:
+        return "😓 No tagged notes to sort."
 
+    return "\n".join(result_lines)
\ No newline at end of file
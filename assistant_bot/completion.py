@@ -0,0 +1,62 @@
+from .indexes import NameTrie # Імпортуємо NameTrie - дерево префіксів для назв команд і імен контактів
+from .registry import command_names # Імпортуємо command_names, щоб доповнювати всі зареєстровані команди
+
+COMPLETION_LIMIT = 100 # Скільки варіантів доповнення показується щонайбільше
+
+# Команди, першим аргументом яких є ім'я контакту
+NAME_COMMANDS = (
+    "editname", "removecontact", "addphone", "changephone", "removephone", "showphone",
+    "addbday", "showbday", "editbday", "removebday", "addemail", "editemail", "removeemail",
+    "addaddress", "editaddress", "removeaddress", "addnote", "editnote", "removenote",
+    "addtag", "removetag",
+)
+
+_command_trie = None
+
+# Дерево назв команд; реєстр не змінюється під час роботи, тож воно будується один раз
+def command_trie():
+    global _command_trie
+    if _command_trie is None:
+        _command_trie = NameTrie()
+        _command_trie.build((name, None) for name in command_names())
+    return _command_trie
+
+# Варіанти доповнення рядка line: назва команди або, після неї, ім'я контакту.
+# Кожен варіант - це весь рядок, бо ім'я може складатися з кількох слів.
+def complete_line(line, book, limit=COMPLETION_LIMIT):
+    if " " not in line:
+        return [name + " " for name in command_trie().complete(line, limit)]
+    command, rest = line.split(" ", 1)
+    if command.lower() not in NAME_COMMANDS:
+        return []
+    with book.reading():
+        names = book.complete_names(rest.lstrip(), limit)
+    return [f"{command} {name} " for name in names]
+
+
+class Completer:
+    """Функція доповнення для readline: варіанти рахуються один раз на натискання Tab."""
+
+    def __init__(self, book):
+        self.book = book
+        self.matches = []
+
+    def __call__(self, text, state):
+        if state == 0:
+            self.matches = complete_line(text, self.book)
+        return self.matches[state] if state < len(self.matches) else None
+
+# Вмикає доповнення за Tab; без модуля readline (наприклад, у Windows) просто нічого не робить
+def setup_readline(book):
+    try:
+        import readline
+    except ImportError:
+        return False
+    # Без роздільників readline передає весь рядок до курсора, тож ім'я з кількох слів доповнюється цілим
+    readline.set_completer_delims("")
+    readline.set_completer(Completer(book))
+    if "libedit" in (readline.__doc__ or ""):
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+    return True
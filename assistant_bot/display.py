@@ -1,47 +1,106 @@
+from itertools import islice # Імпортуємо islice, щоб брати ключі записів по одній сторінці
 from rich.console import Console # Імпортуємо Console з rich для виведення тексту у консоль
 from rich.table import Table # Імпортуємо Table з rich для створення таблиць
 from rich.text import Text # Імпортуємо Text з rich для форматування тексту
+from .decorators import input_error # Імпортуємо input_error для обробки помилок у командах
+from .utils import split_options # Імпортуємо split_options для розбору опцій команди all
 
 console = Console() # Створюємо об'єкт Console для виведення тексту
 
-# Функція для виведення всіх контактів у форматі Rich
-def show_all_rich(book):
+PAGE_SIZE = 20 # Кількість контактів на одній сторінці команди all
+# Гортання сторінок після кожної сторінки вмикає інтерактивний режим (main.py), якщо є термінал
+pager_enabled = False
+
+# Колонки таблиці: назва і стиль
+COLUMNS = (
+    ("Name", "bold magenta"),
+    ("Phones", "green"),
+    ("Birthday", "cyan"),
+    ("Email", "blue"),
+    ("Address", "white"),
+    ("Notes", "yellow"),
+)
+
+# Клітинки одного рядка таблиці для запису
+def record_row(record):
+    phones = ", ".join(phone.value for phone in record.phones) if record.phones else "-"
+    birthday = record.birthday.value if record.birthday else "-"
+    email = record.email.value if record.email else "-"
+    address = record.address.value if record.address else "-"
+
+    notes_block = Text("-")
+    if record.notes:
+        notes_block = Text()
+        for note in record.notes:
+            note_text = Text(note.text, style="bold yellow")
+            tags_text = Text(" " + " ".join(f"#{tag}" for tag in note.tags), style="dim") if note.tags else Text("")
+            notes_block.append_text(note_text)
+            notes_block.append_text(tags_text)
+            notes_block.append("\n")
+
+    return record.name.value, phones, birthday, email, address, notes_block
+
+# Таблиця однієї сторінки; ширина колонок рахується лише для її рядків
+def page_table(records, title):
+    table = Table(title=title, show_lines=True)
+    for name, style in COLUMNS:
+        table.add_column(name, style=style)
+    for record in records:
+        table.add_row(*record_row(record))
+    return table
+
+# Сторінки записів по size штук; записи читаються з книги лише тоді, коли до них доходить черга
+def iter_pages(book, keys, size):
+    keys = iter(keys)
+    while True:
+        page_keys = list(islice(keys, size))
+        if not page_keys:
+            return
+        yield [book.data[key] for key in page_keys]
+
+# Функція для виведення всіх контактів у форматі Rich, сторінка за сторінкою.
+# page - номер однієї сторінки (з 1); без нього виводяться всі сторінки або вмикається гортання.
+def show_all_rich(book, page=None, size=PAGE_SIZE, sort_by_name=False, tag=None, month=None):
     if not book:
         console.print("😓 Address book is empty.", style="yellow")
         return
+    keys = book.select_keys(sort_by_name=sort_by_name, tag=tag, month=month)
+    if not keys:
+        console.print("😓 No contacts match the filter.", style="yellow")
+        return
+    total_pages = (len(keys) + size - 1) // size
+    if page is not None:
+        if page > total_pages:
+            console.print(f"😓 There are only {total_pages} page(s).", style="yellow")
+            return
+        start = (page - 1) * size
+        console.print(page_table([book.data[key] for key in keys[start:start + size]],
+                                 f"📒 Address Book (page {page}/{total_pages})"))
+        return
+    for number, records in enumerate(iter_pages(book, keys, size), start=1):
+        title = "📒 Address Book" if total_pages == 1 else f"📒 Address Book (page {number}/{total_pages})"
+        console.print(page_table(records, title))
+        if pager_enabled and number < total_pages:
+            answer = input(f"-- Page {number}/{total_pages}: Enter for the next page, 'q' to stop -- ")
+            if answer.strip().lower() == "q":
+                return
+    return ""
 
-    table = Table(title="📒 Address Book", show_lines=True)
-    table.add_column("Name", style="bold magenta")
-    table.add_column("Phones", style="green")
-    table.add_column("Birthday", style="cyan")
-    table.add_column("Email", style="blue")
-    table.add_column("Address", style="white")
-    table.add_column("Notes", style="yellow")
-
-    for record in book.values():
-        phones = ", ".join(phone.value for phone in record.phones) if record.phones else "-"
-        birthday = record.birthday.value if record.birthday else "-"
-        email = record.email.value if record.email else "-"
-        address = record.address.value if record.address else "-"
-
-        notes_block = Text("-")
-        if record.notes:
-            notes_block = Text()
-            for note in record.notes:
-                note_text = Text(note.text, style="bold yellow")
-                tags_text = Text(" " + " ".join(f"#{tag}" for tag in note.tags), style="dim") if note.tags else Text("")
-                notes_block.append_text(note_text)
-                notes_block.append_text(tags_text)
-                notes_block.append("\n")
-
-        table.add_row(
-            record.name.value,
-            phones,
-            birthday,
-            email,
-            address,
-            notes_block
-        )
-
-    console.print(table)
+# Обробник команди all: all [page] [size] [--sort name] [--tag TAG] [--month 1-12]
+@input_error
+def show_all(args, book, command="all"):
+    args, options = split_options(args)
+    if len(args) > 2 or not all(arg.isdigit() and int(arg) > 0 for arg in args):
+        raise IndexError
+    page = int(args[0]) if args else None
+    size = int(args[1]) if len(args) > 1 else PAGE_SIZE
+    sort = options.get("sort")
+    if sort is not None and sort.lower() != "name":
+        return "😓 Contacts can only be sorted by name: 'all --sort name'."
+    month = options.get("month")
+    if month is not None:
+        if not month.isdigit() or not 1 <= int(month) <= 12:
+            return "😓 The month must be a number from 1 to 12, for example: 'all --month 5'."
+        month = int(month)
+    show_all_rich(book, page, size, sort_by_name=sort is not None, tag=options.get("tag"), month=month)
     return ""
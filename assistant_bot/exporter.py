@@ -0,0 +1,150 @@
+import csv # Імпортуємо csv для правильного екранування клітинок CSV
+import io # Імпортуємо io, щоб csv.writer писав у буфер рядка
+import json # Імпортуємо json для формату JSONL
+import os # Імпортуємо os, щоб замінити попередній експорт лише готовим файлом
+from .decorators import input_error # Імпортуємо input_error для обробки помилок у команді export
+from .utils import split_options # Імпортуємо split_options для розбору опцій команди export
+
+BUFFER_SIZE = 64 * 1024 # Скільки символів накопичується перед записом у файл
+FORMATS = ("csv", "jsonl", "vcard")
+FIELDS = ("name", "phones", "birthday", "email", "address", "notes")
+EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".json": "jsonl", ".vcf": "vcard", ".vcard": "vcard"}
+
+def detect_format(filename):
+    for extension, file_format in EXTENSIONS.items():
+        if filename.lower().endswith(extension):
+            return file_format
+    return "csv"
+
+# Нотатка у тому ж вигляді, в якому її приймають addnote та import: текст і теги через #
+def note_line(note):
+    return " ".join([note.text] + [f"#{tag}" for tag in note.tags])
+
+# Значення полів запису у простих типах
+def record_values(record):
+    return {
+        "name": record.name.value,
+        "phones": [phone.value for phone in record.phones],
+        "birthday": record.birthday.value if record.birthday else None,
+        "email": record.email.value if record.email else None,
+        "address": record.address.value if record.address else None,
+        "notes": record.notes,
+    }
+
+def csv_lines(records, fields):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(fields)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    for record in records:
+        values = record_values(record)
+        row = []
+        for field in fields:
+            value = values[field]
+            if field == "phones":
+                value = ";".join(value)
+            elif field == "notes":
+                value = "\n".join(note_line(note) for note in value)
+            row.append(value or "")
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+def jsonl_lines(records, fields):
+    for record in records:
+        values = record_values(record)
+        if "notes" in fields:
+            values["notes"] = [{"text": note.text, "tags": list(note.tags)} for note in values["notes"]]
+        yield json.dumps({field: values[field] for field in fields}, ensure_ascii=False) + "\n"
+
+def escape_vcard(value):
+    return value.replace("\\", "\\\\").replace(",", "\\,").replace(";", "\\;").replace("\n", "\\n")
+
+# vCard 3.0; ім'я пишеться завжди, бо FN обов'язкове
+def vcard_lines(records, fields):
+    for record in records:
+        values = record_values(record)
+        lines = ["BEGIN:VCARD", "VERSION:3.0", f"FN:{escape_vcard(values['name'])}", f"N:;{escape_vcard(values['name'])};;;"]
+        if "phones" in fields:
+            lines += [f"TEL;TYPE=cell:{phone}" for phone in values["phones"]]
+        if "birthday" in fields and values["birthday"]:
+            day, month, year = values["birthday"].split(".")
+            lines.append(f"BDAY:{year}-{month}-{day}")
+        if "email" in fields and values["email"]:
+            lines.append(f"EMAIL:{values['email']}")
+        if "address" in fields and values["address"]:
+            lines.append(f"ADR;TYPE=home:;;{escape_vcard(values['address'])};;;;")
+        if "notes" in fields:
+            lines += [f"NOTE:{escape_vcard(note_line(note))}" for note in values["notes"]]
+        lines.append("END:VCARD")
+        yield "\r\n".join(lines) + "\r\n"
+
+LINE_WRITERS = {"csv": csv_lines, "jsonl": jsonl_lines, "vcard": vcard_lines}
+
+# Записи для експорту по одному. Ключі (фільтри тегу, місяця і префікса імені з індексів
+# книги) вибираються одразу, тож помилка у фільтрі трапляється ще до того, як почнеться запис
+def iter_records(book, tag=None, month=None, prefix=None):
+    keys = book.select_keys(tag=tag, month=month, prefix=prefix or None)
+    return (book.data[key] for key in keys)
+
+# Пише рядки у файл частинами приблизно по buffer_size символів; повертає кількість рядків
+def write_buffered(lines, file, buffer_size=BUFFER_SIZE):
+    chunk = []
+    size = 0
+    count = 0
+    for line in lines:
+        chunk.append(line)
+        size += len(line)
+        count += 1
+        if size >= buffer_size:
+            file.write("".join(chunk))
+            chunk, size = [], 0
+    if chunk:
+        file.write("".join(chunk))
+    return count
+
+# Експортує записи у файл; повертає кількість експортованих контактів
+def export_contacts(book, filename, file_format=None, fields=FIELDS, tag=None, month=None, prefix=None):
+    file_format = file_format or detect_format(filename)
+    records = iter_records(book, tag, month, prefix)
+    # Файл пишеться поруч під тимчасовим ім'ям і замінює попередній експорт лише після успішного
+    # запису, тож збій посередині не лишає порожнього чи обрізаного файлу
+    tmp_filename = filename + ".tmp"
+    try:
+        with open(tmp_filename, "w", newline="", encoding="utf-8") as file:
+            count = write_buffered(LINE_WRITERS[file_format](records, list(fields)), file)
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
+    # У CSV перший рядок - заголовок
+    return count - 1 if file_format == "csv" else count
+
+# Обробник команди export:
+# export FILE [--format csv|jsonl|vcard] [--fields name,phones,...] [--tag TAG] [--month 1-12] [--prefix NAME]
+@input_error
+def export_command(args, book, command="export"):
+    args, options = split_options(args)
+    if not args:
+        raise IndexError
+    filename = " ".join(args)
+    file_format = options.get("format", detect_format(filename)).lower()
+    if file_format not in FORMATS:
+        return f"😓 The format must be one of: {', '.join(FORMATS)}."
+    fields = FIELDS
+    if "fields" in options:
+        fields = [field.strip().lower() for field in options["fields"].split(",") if field.strip()]
+        unknown = [field for field in fields if field not in FIELDS]
+        if unknown or not fields:
+            return f"😓 Unknown field(s): {', '.join(unknown) or 'none'}. Available fields: {', '.join(FIELDS)}."
+    month = options.get("month")
+    if month is not None:
+        if not month.isdigit() or not 1 <= int(month) <= 12:
+            return "😓 The month must be a number from 1 to 12, for example: 'export may.csv --month 5'."
+        month = int(month)
+    count = export_contacts(book, filename, file_format, fields, options.get("tag"), month, options.get("prefix"))
+    return f"📤 Exported {count} contact(s) to '{filename}'."
@@ -0,0 +1,296 @@
+import csv # Імпортуємо csv для читання CSV-файлів і звіту про відхилені рядки
+import os # Імпортуємо os для визначення формату за розширенням файлу
+import re # Імпортуємо re для розбору телефонів, тегів і рядків vCard
+from collections import deque # Імпортуємо deque для черги частин, що перевіряються паралельно
+from itertools import islice # Імпортуємо islice, щоб читати файл частинами
+from .book import Phone, Email, Birthday, Note, restore_record # Імпортуємо поля для перевірки значень тими ж правилами, що й у командах
+from .decorators import input_error # Імпортуємо input_error для обробки помилок у команді import
+from .utils import normalize_name, format_address, extract_tags_from_text, split_options # Імпортуємо допоміжні функції
+
+CHUNK_SIZE = 1000 # Скільки рядків файлу читається і перевіряється за раз
+PARALLEL_MIN_SIZE = 1024 * 1024 # З якого розміру файлу (в байтах) перевірка за замовчуванням іде в кількох процесах
+DUPLICATE_POLICIES = ("skip", "merge", "replace")
+VCARD_EXTENSIONS = (".vcf", ".vcard")
+
+# Назви колонок CSV (без урахування регістру) -> поле контакту
+CSV_COLUMNS = {
+    "name": "name",
+    "phone": "phones",
+    "phones": "phones",
+    "birthday": "birthday",
+    "email": "email",
+    "address": "address",
+    "note": "notes",
+    "notes": "notes",
+}
+
+def detect_format(filename):
+    return "vcard" if filename.lower().endswith(VCARD_EXTENSIONS) else "csv"
+
+# Рядки CSV як пари (номер рядка, поля). Телефони в одній клітинці розділяються ';' або ',',
+# нотатки - переносом рядка, теги в нотатках пишуться через #, як у команді addnote.
+def read_csv(file):
+    reader = csv.reader(file)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [CSV_COLUMNS.get(column.strip().lower()) for column in header]
+    if "name" not in columns:
+        raise ValueError("😓 The CSV file needs a 'name' column.")
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        yield reader.line_num, {column: value for column, value in zip(columns, row) if column}
+
+# Рядки vCard зі склеєними продовженнями (рядок, що починається з пробілу, продовжує попередній)
+def unfold_lines(file):
+    line_number, current = 0, None
+    for number, line in enumerate(file, start=1):
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield line_number, current
+        line_number, current = number, line
+    if current is not None:
+        yield line_number, current
+
+def unescape_vcard(value):
+    return re.sub(r"\\(.)", lambda match: "\n" if match.group(1) in "nN" else match.group(1), value)
+
+# Дата vCard (1990-02-01 або 19900201) у форматі бота DD.MM.YYYY
+def vcard_date(value):
+    digits = value.replace("-", "")
+    if len(digits) == 8 and digits.isdigit():
+        return f"{digits[6:8]}.{digits[4:6]}.{digits[0:4]}"
+    return value
+
+# Картки vCard як пари (номер рядка BEGIN:VCARD, поля) у тому ж вигляді, що й рядки CSV
+def read_vcard(file):
+    fields = None
+    start = 0
+    for line_number, line in unfold_lines(file):
+        upper = line.upper()
+        if upper == "BEGIN:VCARD":
+            fields, start = {"phones": [], "notes": []}, line_number
+            continue
+        if upper == "END:VCARD":
+            if fields is not None:
+                fields["phones"] = ";".join(fields["phones"])
+                fields["notes"] = "\n".join(fields["notes"])
+                yield start, fields
+            fields = None
+            continue
+        if fields is None or ":" not in line:
+            continue
+        prop, value = line.split(":", 1)
+        prop = prop.split(";")[0].upper()
+        if prop == "FN":
+            fields["name"] = unescape_vcard(value)
+        elif prop == "N" and "name" not in fields:
+            parts = [unescape_vcard(part) for part in re.split(r"(?<!\\);", value)]
+            fields["name"] = " ".join(part for part in parts[1:2] + parts[:1] if part)
+        elif prop == "TEL":
+            fields["phones"].append(value)
+        elif prop == "BDAY":
+            fields["birthday"] = vcard_date(value)
+        elif prop == "EMAIL":
+            fields.setdefault("email", value)
+        elif prop == "ADR":
+            parts = [unescape_vcard(part) for part in re.split(r"(?<!\\);", value)]
+            fields["address"] = " ".join(part for part in parts if part)
+        elif prop == "NOTE":
+            fields["notes"].append(unescape_vcard(value))
+
+# Номер телефону з довільного запису: лише цифри, міжнародний префікс 38 відкидається
+def clean_phone(raw):
+    digits = "".join(filter(str.isdigit, raw))
+    if len(digits) == 12 and digits.startswith("38"):
+        digits = digits[2:]
+    return digits
+
+# Перевіряє і нормалізує один рядок тими ж правилами, що й команди; повертає значення для restore_record
+def validate_row(fields):
+    name = normalize_name(fields.get("name", ""))
+    if not name:
+        raise ValueError("😓 Name is missing.")
+    phones = []
+    for raw in re.split(r"[;,]", fields.get("phones", "")):
+        digits = clean_phone(raw)
+        if digits and digits not in phones:
+            phones.append(Phone(digits).value)
+    if not phones:
+        raise ValueError("😓 At least one valid phone number is required (10 digits).")
+    birthday = fields.get("birthday", "").strip() or None
+    if birthday:
+        Birthday(birthday)
+    email = fields.get("email", "").strip() or None
+    if email:
+        Email(email)
+    address = format_address(fields.get("address", "").strip()) or None
+    notes = []
+    for text in fields.get("notes", "").splitlines():
+        if text.strip():
+            note = Note(re.sub(r"#\w+", "", text).strip(), extract_tags_from_text(text))
+            notes.append((note.text, note.tags))
+    return name, tuple(phones), birthday, address, email, tuple(notes)
+
+# Перевіряє частину файлу: список (номер рядка, ім'я з файлу, значення або None, помилка або None)
+def validate_chunk(rows):
+    results = []
+    for line_number, fields in rows:
+        try:
+            results.append((line_number, fields.get("name", ""), validate_row(fields), None))
+        except ValueError as e:
+            results.append((line_number, fields.get("name", ""), None, str(e)))
+    return results
+
+
+class RejectReport:
+    """Звіт про відхилені рядки у CSV-файлі; файл створюється лише при першому відхиленні."""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def add(self, line_number, name, reason):
+        if self._file is None:
+            self._file = open(self.filename, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["line", "name", "reason"])
+        self._writer.writerow([line_number, name, reason.lstrip("😓 ")])
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+# Застосовує перевірену частину до книги. Дублікати визначаються через індекси книги:
+# ім'я - через _find_key, телефон - через індекс телефонів, тож кожна перевірка коштує O(1).
+def apply_chunk(book, results, policy, report, stats):
+    for line_number, raw_name, values, error in results:
+        if error is not None:
+            report.add(line_number, raw_name, error)
+            continue
+        name, phones = values[0], values[1]
+        key = book._find_key(name)
+        if key is not None and policy == "skip":
+            report.add(line_number, name, f"A contact named '{key}' already exists.")
+            continue
+        # Телефон не може належати іншому контакту (свій контакт при merge/replace - можна)
+        owner = next((book._phones[phone] for phone in phones if book._phones.get(phone, key) != key), None)
+        if owner is not None:
+            report.add(line_number, name, f"A phone number already belongs to '{owner}'.")
+            continue
+        if key is None:
+            book[name] = restore_record(*values)
+            stats["added"] += 1
+        elif policy == "replace":
+            book[key] = restore_record(key, *values[1:])
+            stats["replaced"] += 1
+        else:
+            merge_record(book, book.data[key], values)
+            stats["merged"] += 1
+
+# Доповнює наявний контакт: нові телефони і нотатки додаються, незаповнені поля заповнюються
+def merge_record(book, record, values):
+    _, phones, birthday, address, email, notes = values
+    for phone in phones:
+        if not any(p.value == phone for p in record.phones):
+            record.add_phone(phone, book)
+    if birthday and not record.birthday:
+        record.add_birthday(birthday)
+    if address and not record.address:
+        record.add_address(address)
+    if email and not record.email:
+        record.add_email(email)
+    for text, tags in notes:
+        record.add_note(text, tags)
+
+# Частини по size елементів
+def chunks(items, size):
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+# Перевірені частини в тому ж порядку, в якому вони прочитані. Із workers > 1 частини перевіряються
+# в ProcessPoolExecutor; у черзі не більше 2 * workers частин, тож пам'ять обмежена розміром частини.
+def validated_chunks(chunks, workers=1):
+    if workers <= 1:
+        for chunk in chunks:
+            yield validate_chunk(chunk)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(validate_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+# Кількість процесів за замовчуванням: малі файли перевіряються в цьому ж процесі
+def default_workers(filename):
+    if os.path.getsize(filename) < PARALLEL_MIN_SIZE:
+        return 1
+    return os.cpu_count() or 1
+
+# Імпортує контакти з CSV або vCard частинами по chunk_size рядків.
+# Перевірка рядків може йти паралельно (workers), але перевірка дублікатів і зміни книги -
+# лише в цьому процесі і в порядку файлу, тому результат такий самий, як і без паралельності.
+# Повертає лічильники added, merged, replaced, rejected і шлях до звіту про відхилені рядки.
+def import_contacts(book, filename, file_format=None, policy="skip", rejects_filename=None, chunk_size=CHUNK_SIZE,
+                    workers=None):
+    file_format = file_format or detect_format(filename)
+    workers = default_workers(filename) if workers is None else workers
+    stats = {"added": 0, "merged": 0, "replaced": 0, "rejected": 0, "rejects_file": None}
+    report = RejectReport(rejects_filename or filename + ".rejects.csv")
+    try:
+        with open(filename, newline="", encoding="utf-8-sig") as file:
+            rows = read_vcard(file) if file_format == "vcard" else read_csv(file)
+            for results in validated_chunks(chunks(rows, chunk_size), workers):
+                apply_chunk(book, results, policy, report, stats)
+    finally:
+        report.close()
+    stats["rejected"] = report.count
+    if report.count:
+        stats["rejects_file"] = report.filename
+    return stats
+
+# Обробник команди import:
+# import FILE [--format csv|vcard] [--on-duplicate skip|merge|replace] [--rejects FILE] [--workers N]
+@input_error
+def import_command(args, book, command="import"):
+    args, options = split_options(args)
+    if not args:
+        raise IndexError
+    filename = " ".join(args)
+    if not os.path.exists(filename):
+        return f"😓 File '{filename}' not found."
+    file_format = options.get("format")
+    if file_format is not None and file_format.lower() not in ("csv", "vcard"):
+        return "😓 The format must be 'csv' or 'vcard'."
+    policy = options.get("on-duplicate", "skip").lower()
+    if policy not in DUPLICATE_POLICIES:
+        return f"😓 The duplicate policy must be one of: {', '.join(DUPLICATE_POLICIES)}."
+    workers = options.get("workers")
+    if workers is not None:
+        if not workers.isdigit() or int(workers) < 1:
+            return "😓 The number of workers must be a positive number, for example: 'import big.csv --workers 4'."
+        workers = int(workers)
+    stats = import_contacts(book, filename, file_format and file_format.lower(), policy, options.get("rejects"),
+                            workers=workers)
+    changed = stats["added"] + stats["merged"] + stats["replaced"]
+    summary = f"{stats['added']} added, {stats['merged']} merged, {stats['replaced']} replaced, {stats['rejected']} rejected"
+    rejects = f"\n📄 Rejected rows are listed in '{stats['rejects_file']}'." if stats["rejects_file"] else ""
+    if not changed:
+        return f"😓 Nothing to import ({summary}).{rejects}"
+    return f"✅ Imported contacts: {summary}.{rejects}"
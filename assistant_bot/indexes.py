@@ -0,0 +1,594 @@
+import bisect # Імпортуємо bisect для роботи з відсортованим списком термінів
+import heapq # Імпортуємо heapq для вибору найближчих імен
+import math # Імпортуємо math для обчислення ваг BM25
+import re # Імпортуємо re для розбиття тексту на слова
+from collections import Counter # Імпортуємо Counter для підрахунку частоти слів
+from datetime import date, datetime # Імпортуємо типи дат для календарного індексу
+
+
+class InvertedIndex:
+    """Базовий клас для інвертованих індексів: термін -> ключі записів адресної книги."""
+
+    # Підкласи, яким потрібні пошук за префіксом чи обхід за алфавітом, вмикають це
+    keep_sorted = False
+    # Індекси, яким досить ключа запису (імені), будуються без читання записів зі сховища
+    from_keys = False
+
+    def __init__(self):
+        self._postings = {}
+        # Ключ запису -> проіндексований документ (кортеж рядків, взятих із запису)
+        self._documents = {}
+        self._sorted_terms = []
+        self._building = False
+
+    # Початкова побудова: відсортований список термінів складається один раз у кінці
+    def build(self, items):
+        self._building = True
+        try:
+            for key, record in items:
+                self.add(key, record)
+        finally:
+            self._building = False
+        if self.keep_sorted:
+            self._sorted_terms = sorted(self._postings)
+
+    # Підкласи визначають, які рядки запису індексуються і на які терміни вони діляться
+    def document(self, record):
+        raise NotImplementedError
+
+    def terms(self, document):
+        raise NotImplementedError
+
+    def add(self, key, record):
+        document = self.document(record)
+        self._documents[key] = document
+        for term in self.terms(document):
+            keys = self._postings.get(term)
+            if keys is None:
+                keys = self._postings[term] = set()
+                if self.keep_sorted and not self._building:
+                    bisect.insort(self._sorted_terms, term)
+            keys.add(key)
+
+    def remove(self, key):
+        document = self._documents.pop(key, None)
+        if document is None:
+            return
+        for term in self.terms(document):
+            keys = self._postings.get(term)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[term]
+                    if self.keep_sorted:
+                        del self._sorted_terms[bisect.bisect_left(self._sorted_terms, term)]
+
+    # Переіндексовує запис лише тоді, коли змінилися його проіндексовані рядки
+    def update(self, key, record):
+        if key in self._documents:
+            if self._documents[key] == self.document(record):
+                return
+            self.remove(key)
+        self.add(key, record)
+
+    def lookup(self, term):
+        return self._postings.get(term, set())
+
+    # Усі терміни за алфавітом (лише для keep_sorted)
+    def sorted_terms(self):
+        return self._sorted_terms
+
+    # Терміни, що починаються з prefix, за алфавітом (лише для keep_sorted)
+    def prefix_terms(self, prefix):
+        start = bisect.bisect_left(self._sorted_terms, prefix)
+        end = start
+        while end < len(self._sorted_terms) and self._sorted_terms[end].startswith(prefix):
+            end += 1
+        return self._sorted_terms[start:end]
+
+    # Перетин списків для кількох термінів, починаючи з найкоротшого
+    def lookup_all(self, terms):
+        postings = sorted((self.lookup(term) for term in set(terms)), key=len)
+        if not postings:
+            return set()
+        result = set(postings[0])
+        for keys in postings[1:]:
+            if not result:
+                break
+            result &= keys
+        return result
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex(InvertedIndex):
+    """Індекс триграм для пошуку підрядка в імені, телефонах, email, адресі та даті народження."""
+
+    def document(self, record):
+        values = [record.name.value]
+        values += [phone.value for phone in record.phones]
+        for field in (record.email, record.address, record.birthday):
+            if field:
+                values.append(field.value)
+        return tuple(values)
+
+    def terms(self, document):
+        result = set()
+        for value in document:
+            result |= trigrams(value.lower())
+        return result
+
+    # Кандидати для підрядка query; None означає, що запит закороткий для індексу
+    def candidates(self, query):
+        query_trigrams = trigrams(query.lower())
+        if not query_trigrams:
+            return None
+        return self.lookup_all(query_trigrams)
+
+
+class TagIndex(InvertedIndex):
+    """Індекс тегів нотаток: тег -> ключі записів, у нотатках яких він є."""
+
+    keep_sorted = True
+
+    def document(self, record):
+        return tuple(sorted({tag for note in record.notes for tag in note.tags}))
+
+    def terms(self, document):
+        return document
+
+
+# Відстань редагування з перестановкою сусідніх літер ("ivna" -> "ivan" - одна правка),
+# але не більша за limit + 1: рядок DP, що вже перевищив межу, зупиняє обчислення
+def edit_distance(a, b, limit):
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                value = min(value, before[j - 2] + 1)
+            current.append(value)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+# Слово і всі його варіанти без однієї літери
+def deletions(word):
+    return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+class NameIndex(InvertedIndex):
+    """Індекс імен контактів: слово імені -> ключі, і триграма -> слова імен.
+
+    Триграми слів дають кандидатів і для пошуку підрядка в імені, і для нечіткого пошуку
+    ("did you mean"): перебираються лише слова зі спільними триграмами, а не вся книга.
+    Короткі слова після однієї правки часто не мають спільних триграм, тому для них
+    зберігаються ще й варіанти без однієї літери. Індекс будується з самих ключів,
+    тож для ледачої книги записи не читаються."""
+
+    from_keys = True
+    SHORT_WORD = 4 # Для слів до цієї довжини зберігаються варіанти без однієї літери
+
+    def __init__(self):
+        super().__init__()
+        # Триграма (з пробілами по краях слова) -> слова імен, у яких вона є
+        self._grams = {}
+        # Коротке слово або воно ж без однієї літери -> короткі слова імен
+        self._deletes = {}
+
+    @staticmethod
+    def word_grams(word):
+        return trigrams(f" {word} ")
+
+    # Документ - ім'я в нижньому регістрі; замість запису передається ключ
+    def document(self, name):
+        return name.lower()
+
+    def terms(self, document):
+        return set(document.split())
+
+    def add(self, key, record=None):
+        for word in self.terms(self.document(key)):
+            if word not in self._postings:
+                for gram in self.word_grams(word):
+                    self._grams.setdefault(gram, set()).add(word)
+                if len(word) <= self.SHORT_WORD:
+                    for variant in deletions(word):
+                        self._deletes.setdefault(variant, set()).add(word)
+        super().add(key, key)
+
+    def remove(self, key):
+        document = self._documents.get(key)
+        super().remove(key)
+        if document is None:
+            return
+        for word in self.terms(document):
+            if word not in self._postings:
+                self._discard(self._grams, self.word_grams(word), word)
+                if len(word) <= self.SHORT_WORD:
+                    self._discard(self._deletes, deletions(word), word)
+
+    @staticmethod
+    def _discard(mapping, terms, word):
+        for term in terms:
+            words = mapping.get(term)
+            if words is not None:
+                words.discard(word)
+                if not words:
+                    del mapping[term]
+
+    # Ключ запису - це його ім'я, тож зміни полів запису індекс не зачіпають
+    def update(self, key, record):
+        if key not in self._documents:
+            self.add(key)
+
+    # Ключі, в імені яких може бути підрядок query (без перевірки); None - запит закороткий
+    def substring_candidates(self, query):
+        piece = max(query.split(), key=len, default="")
+        grams = trigrams(piece)
+        if not grams:
+            return None
+        words = None
+        for gram in sorted(grams, key=lambda gram: len(self._grams.get(gram, ()))):
+            words = set(self._grams.get(gram, ())) if words is None else words & self._grams.get(gram, set())
+            if not words:
+                return set()
+        keys = set()
+        for word in words:
+            if piece in word:
+                keys |= self._postings[word]
+        return keys
+
+    # Слова імен на відстані редагування не більше max_distance від word: {слово: відстань}
+    def similar_words(self, word, max_distance):
+        if len(word) < self.SHORT_WORD and max_distance <= 1:
+            # Слова на відстані 1 мають спільний варіант без однієї літери
+            candidates = set()
+            for variant in deletions(word):
+                candidates |= self._deletes.get(variant, set())
+        else:
+            grams = self.word_grams(word)
+            shared = Counter()
+            for gram in grams:
+                shared.update(self._grams.get(gram, ()))
+            # Кожна правка змінює не більше трьох триграм, тож далекі слова відсіюються без обчислень
+            needed = max(1, len(grams) - 3 * max_distance)
+            candidates = [candidate for candidate, count in shared.items() if count >= needed]
+        result = {}
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                result[candidate] = distance
+        return result
+
+    # Ключі, схожі на name: кожне слово запиту має бути схожим на якесь слово імені.
+    # Результат відсортовано за сумою відстаней, кількістю слів імені і порядком order.
+    def similar(self, name, order, limit=5):
+        words = name.lower().split()
+        if not words:
+            return []
+        scores = None
+        for word in words:
+            matches = self.similar_words(word, 1 if len(word) <= 3 else 2)
+            word_scores = {}
+            for match, distance in matches.items():
+                for key in self._postings[match]:
+                    if distance < word_scores.get(key, distance + 1):
+                        word_scores[key] = distance
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {key: score + word_scores[key] for key, score in scores.items() if key in word_scores}
+            if not scores:
+                return []
+        # При однаковій відстані ближчі ті імена, в яких менше зайвих слів
+        return heapq.nsmallest(limit, scores, key=lambda key: (scores[key], len(self._documents[key].split()), order[key]))
+
+
+def tokenize(text):
+    return re.findall(r"\w+", text.lower())
+
+
+class NoteTextIndex(InvertedIndex):
+    """Повнотекстовий індекс нотаток: слово -> ключі записів, з ранжуванням результатів за BM25."""
+
+    keep_sorted = True
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        super().__init__()
+        # Статистика по окремих нотатках для BM25: у скількох нотатках є слово, кількість і довжина нотаток
+        self._note_freq = {}
+        self._note_count = 0
+        self._total_length = 0
+
+    def document(self, record):
+        return (record.name.value,) + tuple(note.text for note in record.notes)
+
+    # Слова кожної нотатки; ім'я контакту теж входить до кожної нотатки, як і раніше в searchnote
+    def note_tokens(self, document):
+        name_tokens = tokenize(document[0])
+        for text in document[1:]:
+            yield tokenize(text) + name_tokens
+
+    def terms(self, document):
+        result = set()
+        for tokens in self.note_tokens(document):
+            result.update(tokens)
+        return result
+
+    def add(self, key, record):
+        super().add(key, record)
+        self._count_notes(self._documents[key], 1)
+
+    def remove(self, key):
+        document = self._documents.get(key)
+        if document is not None:
+            self._count_notes(document, -1)
+        super().remove(key)
+
+    def _count_notes(self, document, sign):
+        for tokens in self.note_tokens(document):
+            self._note_count += sign
+            self._total_length += sign * len(tokens)
+            for token in set(tokens):
+                count = self._note_freq.get(token, 0) + sign
+                if count:
+                    self._note_freq[token] = count
+                else:
+                    del self._note_freq[token]
+
+    # Записи, в нотатках яких є слова з усіма префіксами запиту
+    def candidates(self, query_tokens):
+        keys = None
+        for query_token in query_tokens:
+            matched = set()
+            for term in self.prefix_terms(query_token):
+                matched |= self.lookup(term)
+            keys = matched if keys is None else keys & matched
+            if not keys:
+                return set()
+        return keys or set()
+
+    # Оцінка BM25 для однієї нотатки; None, якщо якесь слово запиту в ній відсутнє
+    def score(self, tokens, query_tokens):
+        counts = Counter(tokens)
+        average_length = self._total_length / self._note_count if self._note_count else 1
+        norm = self.K1 * (1 - self.B + self.B * len(tokens) / average_length)
+        score = 0.0
+        for query_token in query_tokens:
+            matched = [token for token in counts if token.startswith(query_token)]
+            if not matched:
+                return None
+            for token in matched:
+                freq = self._note_freq.get(token, 0)
+                idf = math.log(1 + (self._note_count - freq + 0.5) / (freq + 0.5))
+                score += idf * counts[token] * (self.K1 + 1) / (counts[token] + norm)
+        return score
+
+
+def is_leap_year(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+class BirthdayIndex:
+    """Календарний індекс днів народження: записи відсортовані за місяцем і днем."""
+
+    from_keys = False
+
+    def __init__(self):
+        # Відсортований список (місяць, день, ключ запису)
+        self._entries = []
+        # Ключ запису -> (рядок дати, місяць, день), щоб не розбирати незмінену дату повторно
+        self._dates = {}
+
+    def build(self, items):
+        for key, record in items:
+            entry = self._parse(key, record)
+            if entry is not None:
+                self._entries.append(entry)
+        self._entries.sort()
+
+    def _parse(self, key, record):
+        if not record.birthday:
+            return None
+        try:
+            birthday_date = datetime.strptime(record.birthday.value, "%d.%m.%Y").date()
+        except ValueError:
+            return None
+        self._dates[key] = (record.birthday.value, birthday_date.month, birthday_date.day)
+        return birthday_date.month, birthday_date.day, key
+
+    def add(self, key, record):
+        entry = self._parse(key, record)
+        if entry is not None:
+            bisect.insort(self._entries, entry)
+
+    def remove(self, key):
+        value = self._dates.pop(key, None)
+        if value is None:
+            return
+        _, month, day = value
+        del self._entries[bisect.bisect_left(self._entries, (month, day, key))]
+
+    def update(self, key, record):
+        value = self._dates.get(key)
+        if value is not None and record.birthday and value[0] == record.birthday.value:
+            return
+        self.remove(key)
+        self.add(key, record)
+
+    # Ключі записів, день народження яких припадає на місяць month (1-12)
+    def keys_in_month(self, month):
+        first = bisect.bisect_left(self._entries, (month,))
+        last = bisect.bisect_left(self._entries, (month + 1,))
+        return {key for _, _, key in self._entries[first:last]}
+
+    # Ключі записів із днем народження між start і end включно, як пари (дата, ключ).
+    # 29 лютого у невисокосний рік святкується 1 березня.
+    def between(self, start, end):
+        result = []
+        for year in range(start.year, end.year + 1):
+            low = max(start, date(year, 1, 1))
+            high = min(end, date(year, 12, 31))
+            if low > high:
+                continue
+            low_key = (low.month, low.day)
+            if not is_leap_year(year) and low_key == (3, 1):
+                low_key = (2, 29)
+            first = bisect.bisect_left(self._entries, low_key)
+            last = bisect.bisect_left(self._entries, (high.month, high.day + 1))
+            for month, day, key in self._entries[first:last]:
+                if (month, day) == (2, 29) and not is_leap_year(year):
+                    result.append((date(year, 3, 1), key))
+                else:
+                    result.append((date(year, month, day), key))
+        return result
+
+
+class TrieNode:
+    """Вузол дерева імен: діти за наступним словом і ключі імен, що закінчуються тут."""
+    __slots__ = ("children", "words", "keys")
+
+    def __init__(self):
+        self.children = None # слово -> вузол
+        self.words = None # ті самі слова за алфавітом, для пошуку за початком слова
+        self.keys = None # ключі записів з іменем, що закінчується в цьому вузлі
+
+
+class NameTrie:
+    """Дерево префіксів імен по словах (у нижньому регістрі).
+
+    Шлях до вузла коштує стільки кроків, скільки слів у префіксі, а недописане останнє
+    слово шукається двійковим пошуком серед слів-дітей. Вузол на слово, а не на літеру,
+    тримає дерево компактним навіть для сотень тисяч імен."""
+
+    from_keys = True
+
+    def __init__(self):
+        self.root = TrieNode()
+        self._building = False
+
+    # Початкова побудова: слова дітей сортуються один раз у кінці
+    def build(self, items):
+        self._building = True
+        try:
+            for key, _ in items:
+                self.add(key)
+        finally:
+            self._building = False
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.children:
+                node.words.sort()
+                stack.extend(node.children.values())
+
+    def add(self, key, record=None):
+        node = self.root
+        for word in key.lower().split():
+            if node.children is None:
+                node.children, node.words = {}, []
+            child = node.children.get(word)
+            if child is None:
+                child = node.children[word] = TrieNode()
+                if self._building:
+                    node.words.append(word)
+                else:
+                    bisect.insort(node.words, word)
+            node = child
+        if node.keys is None:
+            node.keys = []
+        if key not in node.keys:
+            node.keys.append(key)
+
+    # Вузол для послідовності слів або None
+    def find_node(self, words):
+        node = self.root
+        for word in words:
+            if not node.children:
+                return None
+            node = node.children.get(word)
+            if node is None:
+                return None
+        return node
+
+    def remove(self, key):
+        path = []
+        node = self.root
+        for word in key.lower().split():
+            if not node.children or word not in node.children:
+                return
+            path.append((node, word))
+            node = node.children[word]
+        if not node.keys or key not in node.keys:
+            return
+        node.keys.remove(key)
+        if not node.keys:
+            node.keys = None
+        # Порожні вузли прибираються знизу вгору
+        for parent, word in reversed(path):
+            child = parent.children[word]
+            if child.keys or child.children:
+                break
+            del parent.children[word]
+            del parent.words[bisect.bisect_left(parent.words, word)]
+            if not parent.children:
+                parent.children = parent.words = None
+
+    # Найдовший початок words (не довший за limit слів), що є повним іменем, за один прохід
+    # зліва направо: (кількість слів імені, ключ) або (0, None)
+    def longest_prefix(self, words, limit=None):
+        found = (0, None)
+        node = self.root
+        for count, word in enumerate(words[:limit], 1):
+            if not node.children:
+                break
+            node = node.children.get(word.lower())
+            if node is None:
+                break
+            if node.keys:
+                found = (count, node.keys[0])
+        return found
+
+    # Ключ - це ім'я, тож дерево змінюється лише тоді, коли ключ з'являється вперше
+    def update(self, key, record):
+        node = self.find_node(key.lower().split())
+        if node is None or not node.keys or key not in node.keys:
+            self.add(key)
+
+    # До limit ключів (None - усі), ім'я яких починається з prefix (без урахування регістру), за алфавітом
+    def complete(self, prefix, limit=100):
+        words = prefix.lower().split()
+        partial = "" if not prefix or prefix[-1].isspace() else words.pop()
+        node = self.find_node(words)
+        if node is None:
+            return []
+        if partial:
+            if not node.children:
+                return []
+            start = bisect.bisect_left(node.words, partial)
+            end = start
+            while end < len(node.words) and node.words[end].startswith(partial):
+                end += 1
+            stack = [node.children[word] for word in reversed(node.words[start:end])]
+        elif words:
+            # "ivan " - лише довші імена, що продовжують уже дописані слова
+            stack = [node.children[word] for word in reversed(node.words or [])]
+        else:
+            stack = [node]
+        result = []
+        while stack and (limit is None or len(result) < limit):
+            node = stack.pop()
+            if node.keys:
+                result.extend(node.keys if limit is None else node.keys[:limit - len(result)])
+            if node.children:
+                stack.extend(node.children[word] for word in reversed(node.words))
+        return result
@@ -1,32 +1,95 @@
-from assistant_bot.storage import DEFAULT_FILENAME
-from assistant_bot.storage import save_address_book, load_address_book
-from assistant_bot.commands import (
-    add_contact, edit_contact_name, remove_contact, add_phone_to_contact, change_contact,
-    remove_phone, show_phone, add_birthday, show_birthday, edit_birthday, remove_birthday,
-    add_email, edit_email, remove_email, add_note, edit_note, remove_note, search_note,
-    add_tag_to_note, remove_tag_from_note, search_note_by_tag, sort_note_by_tag,
-    add_address, edit_address, remove_address, search_contacts, upcoming_birthdays
-)
-from assistant_bot.utils import parse_input, suggest_command
-from assistant_bot.help import print_available_commands
-from assistant_bot.utils import suggest_command
-from assistant_bot.display import show_all_rich
-from rich.console import Console
+import argparse
+import sys
+from assistant_bot.storage import DEFAULT_FILENAME, open_storage, BackgroundSaver
+from assistant_bot.registry import execute_command, unknown_command, EXIT_COMMANDS
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="assistant_bot", description="Console assistant bot for contacts and notes.")
+    parser.add_argument("--file", default=DEFAULT_FILENAME, help="address book file; .db/.sqlite files use SQLite (default: %(default)s)")
+    parser.add_argument("--shared", action="store_true",
+                        help="let several bot processes work on the same .pkl book: file locking and reloading of each other's changes")
+    parser.add_argument("--batch", metavar="SCRIPT", help="run commands from SCRIPT ('-' for stdin) instead of the interactive prompt")
+    parser.add_argument("--save-every", type=int, metavar="N", help="in batch mode, also save after every N commands")
+    parser.add_argument("--serve", nargs="?", const="127.0.0.1:8765", metavar="ADDRESS",
+                        help="serve the book to many clients on 'host:port' or 'unix:/path' (default: %(const)s)")
+    parser.add_argument("--connect", nargs="?", const="127.0.0.1:8765", metavar="ADDRESS",
+                        help="open the interactive prompt against a running server (default: %(const)s)")
+    parser.add_argument("--stats", action="store_true", help="collect per-command latency and error statistics (see the 'stats' command)")
+    parser.add_argument("--stats-file", metavar="FILE", help="collect statistics and write them to FILE as JSON on exit")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="run a single command and exit, e.g. 'search Ivan'")
+    return parser.parse_args(argv)
+
+# Виконує одну команду з командного рядка без запуску інтерактивного режиму
+def run_once(words, book, storage):
+    command, args = words[0].lower(), words[1:]
+    if command in EXIT_COMMANDS:
+        print("👋 Good bye!")
+        return 0
+    result, changed = execute_command(command, args, book)
+    if result is None:
+        print(unknown_command(command))
+        return 1
+    if result:
+        print(result)
+    if changed:
+        storage.save(book)
+    return 0
+
+def main(argv=None):
+    options = parse_args(argv)
+    if options.stats or options.stats_file:
+        from assistant_bot import stats
+        stats.enable()
+    if options.connect:
+        from assistant_bot.client import run_client
+        return run_client(options.connect)
+    storage = open_storage(options.file, shared=options.shared)
+    try:
+        book = storage.load()
+        if options.command:
+            return run_once(options.command, book, storage)
+        if options.serve:
+            return run_server(book, storage, options.serve)
+        if options.batch:
+            from assistant_bot.batch import run_batch, read_commands
+            # Для спільної книги весь пакет виконується під одним блокуванням файлу
+            with book.writing():
+                run_batch(read_commands(options.batch), book, storage, save_every=options.save_every)
+            return 0
+        interactive(book, storage)
+        return 0
+    finally:
+        storage.close()
+        if options.stats_file:
+            stats.dump(options.stats_file)
+
+def run_server(book, storage, address):
+    import asyncio
+    from assistant_bot.server import serve
+    try:
+        asyncio.run(serve(book, storage, address))
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped, address book saved.")
+    except ValueError as e:
+        print(e)
+        return 1
+    except OSError as e:
+        print(f"😓 Cannot start the server on {address}: {e}")
+        return 1
+    return 0
+
+def interactive(book, storage):
+    from rich.console import Console
+    from assistant_bot.utils import parse_input
+    from assistant_bot import display
     console = Console()
-    filename = DEFAULT_FILENAME
-    book = load_address_book(filename)
-    valid_commands = [
-        "hello", "help", "exit", "close", "addcontact", "editname", "removecontact",
-        "addphone", "changephone", "removephone", "showphone", "addbday", "showbday",
-        "editbday", "removebday", "upcomingbdays", "search", "all", "addemail",
-        "editemail", "removeemail", "addaddress", "editaddress", "removeaddress",
-        "addnote", "editnote", "removenote", "searchnote", "addtag", 
-        "removetag", "searchtag", "sorttag"
-    ]
+    # Команда all гортає сторінки лише тоді, коли користувач сидить за терміналом
+    display.pager_enabled = sys.stdin.isatty() and sys.stdout.isatty()
+    from assistant_bot.completion import setup_readline
+    setup_readline(book)
+    saver = BackgroundSaver(book, storage)
     console.print("😊 Welcome to the assistant bot!", style="green")
-    console.print(f"Upcoming Birthdays:\n{upcoming_birthdays([], book)}", style="yellow")
+    console.print(f"Upcoming Birthdays:\n{execute_command('upcomingbdays', [], book)[0]}", style="yellow")
     console.print("\nType 'help' to see available commands.", style="blue")
     try:
         while True:
@@ -35,136 +98,25 @@ def main():
                 console.print("😓 You didn’t enter anything! Please try again.", style="yellow")
                 continue
             command, args = parse_input(user_input)
-            if command in ["exit", "close", "ex"]:
-                save_address_book(book, filename)
+            if command in EXIT_COMMANDS:
+                saver.close()
                 console.print("👋 Good bye!", style="green")
                 break
-            elif command == "hello":
-                console.print("😊 How can I help you?", style="green")
-            elif command == "addcontact":
-                result = add_contact(args, book, command="addcontact")
-                console.print(result, style="green")
-                if "added" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "editname":
-                result = edit_contact_name(args, book, command="editname")
-                console.print(result, style="green")
-                if "changed" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "removecontact":
-                result = remove_contact(args, book, command="removecontact")
-                console.print(result, style="green")
-                if "removed" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "addphone":
-                result = add_phone_to_contact(args, book, command="addphone")
-                console.print(result, style="green")
-                if "added" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "changephone":
-                result = change_contact(args, book, command="changephone")
-                console.print(result, style="green")
-                if "updated" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "removephone":
-                result = remove_phone(args, book, command="removephone")
-                console.print(result, style="green")
-                if "removed" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "showphone":
-                console.print(show_phone(args, book, command="showphone"), style="green")
-            elif command == "addbday":
-                result = add_birthday(args, book, command="addbday")
-                console.print(result, style="green")
-                if "added" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "showbday":
-                console.print(show_birthday(args, book, command="showbday"), style="green")
-            elif command == "editbday":
-                result = edit_birthday(args, book, command="editbday")
-                console.print(result, style="green")
-                if "updated" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "removebday":
-                result = remove_birthday(args, book, command="removebday")
-                console.print(result, style="green")
-                if "removed" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "upcomingbdays":
-                console.print(upcoming_birthdays(args, book, command="upcomingbdays"), style="green")
-            elif command == "search":
-                console.print(search_contacts(args, book, command="search"), style="green")
-            elif command == "all":
-                show_all_rich(book)
-            elif command == "addemail":
-                result = add_email(args, book, command="addemail")
-                console.print(result, style="green")
-                if "added" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "editemail":
-                result = edit_email(args, book, command="editemail")
-                console.print(result, style="green")
-                if "updated" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "removeemail":
-                result = remove_email(args, book, command="removeemail")
-                console.print(result, style="green")
-                if "removed" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "addnote":
-                result = add_note(args, book, command="addnote")
-                console.print(result, style="green")
-                if "added" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "editnote":
-                result = edit_note(args, book, command="editnote")
-                console.print(result, style="green")
-                if "updated" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "removenote":
-                result = remove_note(args, book, command="removenote")
-                console.print(result, style="green")
-                if "removed" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "searchnote":
-                console.print(search_note(args, book, command="searchnote"), style="green")
-            elif command == "addtag":
-                result = add_tag_to_note(args, book, command="addtag")
-                console.print(result, style="green")
-                save_address_book(book, filename)
-            elif command == "removetag":
-                result = remove_tag_from_note(args, book, command="removetag")
-                console.print(result, style="green")
-                save_address_book(book, filename)
-            elif command == "searchtag":
-                result = search_note_by_tag(args, book, command="searchtag")
-                console.print(result, style="green")
-            elif command == "sorttag":
-                result = sort_note_by_tag(args, book, command="sorttag")
-                console.print(result, style="green")
-            elif command == "addaddress":
-                result = add_address(args, book, command="addaddress")
-                console.print(result, style="green")
-                if "added" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "editaddress":
-                result = edit_address(args, book, command="editaddress")
-                console.print(result, style="green")
-                if "updated" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "removeaddress":
-                result = remove_address(args, book, command="removeaddress")
+            with saver.lock:
+                result, changed = execute_command(command, args, book)
+            if result is None:
+                console.print(unknown_command(command), style="yellow")
+                continue
+            if result:
                 console.print(result, style="green")
-                if "removed" in result.lower():
-                    save_address_book(book, filename)
-            elif command == "help":
-                print_available_commands()
-            else:
-                console.print(suggest_command(command, valid_commands), style="yellow")
+            if changed:
+                saver.schedule()
     except KeyboardInterrupt:
         console.print("\n👋 Good bye!", style="green")
-        save_address_book(book, filename)
+        saver.close()
         console.print("📚 Address book saved successfully.", style="green")
+    finally:
+        saver.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
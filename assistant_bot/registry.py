@@ -0,0 +1,156 @@
+import importlib # Імпортуємо importlib, щоб завантажувати модулі команд лише при першому виклику
+
+EXIT_COMMANDS = ["exit", "close", "ex"]
+
+
+class Command:
+    """Клас для опису команди: обробник, групи довідки, політика збереження і текст помилки."""
+    __slots__ = ("name", "handler_path", "groups", "saves_on", "error", "_handler")
+
+    def __init__(self, name, handler_path, groups=(), saves_on=None, error=None):
+        self.name = name
+        # Обробник задається рядком "модуль:функція" і імпортується при першому виклику
+        self.handler_path = handler_path
+        self.groups = groups
+        # Коли зберігати книгу: None - ніколи, True - завжди, рядок - якщо він є у відповіді
+        self.saves_on = saves_on
+        self.error = error
+        self._handler = None
+
+    @property
+    def handler(self):
+        if self._handler is None:
+            module_name, function_name = self.handler_path.split(":")
+            self._handler = getattr(importlib.import_module(module_name), function_name)
+        return self._handler
+
+    # Виконує команду і повертає (текст відповіді, чи змінилася книга).
+    # Якщо в книзі ввімкнено блокування, команди читання йдуть паралельно, а зміна - цілком атомарно.
+    def run(self, args, book):
+        lock = getattr(book, "_lock", None)
+        if lock is None:
+            result = self.handler(args, book, command=self.name)
+        else:
+            with (lock.read() if self.read_only else lock.write()):
+                result = self.handler(args, book, command=self.name)
+        return result, self.changes_book(result)
+
+    # Команди без політики збереження лише читають книгу
+    @property
+    def read_only(self):
+        return self.saves_on is None
+
+    def changes_book(self, result):
+        if self.saves_on is None:
+            return False
+        if self.saves_on is True:
+            return True
+        return self.saves_on in (result or "").lower()
+
+
+COMMANDS = {}
+
+def register(name, handler_path, groups=(), saves_on=None, error=None):
+    COMMANDS[name] = Command(name, handler_path, groups, saves_on, error)
+
+# Усі команди бота. Порядок реєстрації визначає порядок у довідці та підказках.
+register("hello", "assistant_bot.commands:hello", groups=("General",))
+register("help", "assistant_bot.help:show_help", groups=("General",))
+register("exit", None, groups=("General",))
+register("close", None, groups=("General",))
+register("stats", "assistant_bot.stats:stats_command", groups=("General",), error="😓 Usage: 'stats', 'stats reset' or 'stats --dump stats.json'. Statistics are collected when the bot is started with '--stats'.")
+register("addcontact", "assistant_bot.commands:add_contact", groups=("Contacts",), saves_on="added", error=(
+    "😓 The 'addcontact' command requires at least a name and a 10-digit phone number.\n"
+    "👉 You can also optionally add more phone numbers, an email and an address.\n"
+    "🔹 Examples:\n"
+    "   'addcontact Ivan 0987654321'\n"
+    "   'addcontact Ivan Petrov 0981112222 0663334444'\n"
+    "   'addcontact Ivan 0987654321 ivan@example.com'\n"
+    "   'addcontact Ivan 0987654321 ivan@gmail.com vul. Parkova 12, Kyiv'\n"
+))
+register("editname", "assistant_bot.commands:edit_contact_name", groups=("Contacts",), saves_on="changed", error="😓 The 'editname' command requires the old and new name. For example: 'editname Ivan Petro'")
+register("removecontact", "assistant_bot.commands:remove_contact", groups=("Contacts",), saves_on="removed", error="😓 The 'removecontact' command requires a name. For example: 'removecontact Ivan'")
+register("search", "assistant_bot.commands:search_contacts", groups=("Contacts", "Phones", "Birthdays", "Email", "Address"), error="😓 The 'search' command requires a query like name, phone, birthday, email or address. For example: 'search Ivan' or 'search 0661234567' or search '15.05.1990' or search 'ivan@example.com' or search 'vul. 3, Kyiv'")
+register("all", "assistant_bot.display:show_all", groups=("Contacts",), error=(
+    "😓 Usage: 'all [page] [size] [--sort name] [--tag TAG] [--month 1-12]'. For example:\n"
+    "   'all' — all contacts, page by page\n"
+    "   'all 2' or 'all 2 50' — only page 2 (20 or 50 contacts per page)\n"
+    "   'all --sort name --tag work' or 'all --month 5'"
+))
+register("addphone", "assistant_bot.commands:add_phone_to_contact", groups=("Phones",), saves_on="added", error="😓 The 'addphone' command requires a name and a phone number. For example: 'addphone Ivan 0661234567'")
+register("changephone", "assistant_bot.commands:change_contact", groups=("Phones",), saves_on="updated", error="😓 The 'changephone' command requires a name, the old number and the new number. For example: 'changephone Ivan 0661234567 0961234567'")
+register("removephone", "assistant_bot.commands:remove_phone", groups=("Phones",), saves_on="removed", error="😓 The 'removephone' command requires a name and a phone number to remove. For example: 'removephone Ivan 0661234567'")
+register("showphone", "assistant_bot.commands:show_phone", groups=("Phones",), error="😓 The 'showphone' command requires only a name. For example: 'showphone Ivan'")
+register("addbday", "assistant_bot.commands:add_birthday", groups=("Birthdays",), saves_on="added", error="😓 The 'addbday' command requires a name and a date (DD.MM.YYYY). For example: 'addbday Ivan 15.05.1990'")
+register("showbday", "assistant_bot.commands:show_birthday", groups=("Birthdays",), error="😓 The 'showbday' command requires only a name. For example: 'showbday Ivan'")
+register("editbday", "assistant_bot.commands:edit_birthday", groups=("Birthdays",), saves_on="updated", error="😓 The 'editbday' command requires a name and a new date (DD.MM.YYYY). For example: 'editbday Ivan 16.05.1990'")
+register("removebday", "assistant_bot.commands:remove_birthday", groups=("Birthdays",), saves_on="removed", error="😓 The 'removebday' command requires a name. For example: 'removebday Ivan'")
+register("upcomingbdays", "assistant_bot.commands:upcoming_birthdays", groups=("Birthdays",), error="😓 The 'upcomingbdays' command takes an optional number of days or a date range. For example: 'upcomingbdays', 'upcomingbdays 30' or 'upcomingbdays 01.06.2025 30.06.2025'")
+register("addemail", "assistant_bot.commands:add_email", groups=("Email",), saves_on="added", error="😓 The 'addemail' command requires a name and an email. For example: 'addemail Ivan ivan@example.com'")
+register("editemail", "assistant_bot.commands:edit_email", groups=("Email",), saves_on="updated", error="😓 The 'editemail' command requires a name and a new email. For example: 'editemail Ivan new@example.com'")
+register("removeemail", "assistant_bot.commands:remove_email", groups=("Email",), saves_on="removed", error="😓 The 'removeemail' command requires a name. For example: 'removeemail Ivan'")
+register("addaddress", "assistant_bot.commands:add_address", groups=("Address",), saves_on="added", error="😓 The 'addaddress' command requires a name and an address. For example: 'addaddress Ivan vul. Vilna 1, Kyiv'")
+register("editaddress", "assistant_bot.commands:edit_address", groups=("Address",), saves_on="updated", error="😓 The 'editaddress' command requires a name and a new address. For example: 'editaddress Ivan vul. New 2, Kyiv'")
+register("removeaddress", "assistant_bot.commands:remove_address", groups=("Address",), saves_on="removed", error="😓 The 'removeaddress' command requires a name. For example: 'removeaddress Ivan'")
+register("addnote", "assistant_bot.commands:add_note", groups=("Notes",), saves_on="added", error="😓 The 'addnote' command requires a name and a note text. You can optionally include tags using #. For example: 'addnote Ivan Meeting at 3:00 PM #urgent'")
+register("editnote", "assistant_bot.commands:edit_note", groups=("Notes",), saves_on="updated", error="😓 The 'editnote' command requires a name, the old note and the new note. You can also include tags. For example: 'editnote Ivan Meeting at 3:00 PM Meeting rescheduled to 4:00 PM #urgent'")
+register("removenote", "assistant_bot.commands:remove_note", groups=("Notes",), saves_on="removed", error=(
+    "😓 The 'removenote' command requires a name and optionally the note text.\n"
+    "🔹 Example 1 (remove specific note): 'removenote Ivan Meeting at 3:00 PM'\n"
+    "🔹 Example 2 (remove all notes): 'removenote Ivan'"
+))
+register("searchnote", "assistant_bot.commands:search_note", groups=("Notes",), error="😓 The 'searchnote' command requires a keyword query. All words must match, best matches come first. For example: 'searchnote Meeting' or 'searchnote project meet --limit 5'")
+register("addtag", "assistant_bot.commands:add_tag_to_note", groups=("Notes",), saves_on=True, error="😓 The 'addtag' command requires a name, the note text and the tag. For example: 'addtag Ivan Project planning #meeting'")
+register("removetag", "assistant_bot.commands:remove_tag_from_note", groups=("Notes",), saves_on=True, error=(
+    "😓 The 'removetag' command requires a name, the note text and a tag to remove.\n"
+    "🔹 Example 1 (remove specific tag): 'removetag Ivan Meeting at 3:00 PM #urgent'\n"
+    "🔹 Example 2 (remove all tags from note): 'removetag Ivan Meeting at 3:00 PM'"
+))
+register("searchtag", "assistant_bot.commands:search_note_by_tag", groups=("Notes",), error="😓 The 'searchtag' command requires a tag. For example: 'searchtag #urgent' or 'searchtag #proj*' for every tag starting with 'proj'")
+register("sorttag", "assistant_bot.commands:sort_note_by_tag", groups=("Notes",))
+register("import", "assistant_bot.importer:import_command", groups=("Import & Export",), saves_on="imported", error=(
+    "😓 The 'import' command requires a CSV or vCard file.\n"
+    "🔹 CSV columns: name, phones, birthday, email, address, notes (a header row is required).\n"
+    "🔹 Examples: 'import contacts.csv', 'import people.vcf --on-duplicate merge', 'import data.csv --rejects bad.csv'"
+))
+register("export", "assistant_bot.exporter:export_command", groups=("Import & Export",), error=(
+    "😓 The 'export' command requires a file name; the format comes from its extension (.csv, .jsonl, .vcf) or --format.\n"
+    "🔹 Examples: 'export contacts.csv', 'export people.vcf --tag work',\n"
+    "   'export may.jsonl --month 5 --fields name,phones,birthday', 'export iv.csv --prefix Iv'"
+))
+
+DEFAULT_ERROR = "😓 Invalid command or arguments. Type 'help' to see available commands."
+
+
+def get_command(name):
+    return COMMANDS.get(name)
+
+def command_names():
+    return list(COMMANDS)
+
+# Групи команд для довідки у порядку реєстрації
+def command_groups():
+    groups = {}
+    for command in COMMANDS.values():
+        for group in command.groups:
+            groups.setdefault(group, []).append(command.name)
+    return groups
+
+def error_message(name):
+    command = COMMANDS.get(name)
+    return command.error if command and command.error else DEFAULT_ERROR
+
+# Виконує команду за назвою; для невідомої команди повертає (None, False)
+def execute_command(name, args, book):
+    command = COMMANDS.get(name)
+    if command is None or command.handler_path is None:
+        return None, False
+    return command.run(args, book)
+
+# Підказка для невідомої команди
+def unknown_command(name):
+    from .utils import suggest_command
+    from .completion import command_trie
+    names = command_names()
+    prefix_matches = sorted(command_trie().complete(name), key=names.index)
+    return suggest_command(name, names, prefix_matches)
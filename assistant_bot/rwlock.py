@@ -0,0 +1,97 @@
+import threading # Імпортуємо threading для умовної змінної блокування
+from contextlib import contextmanager # Імпортуємо contextmanager для блоків with lock.read() / lock.write()
+
+
+class RWLock:
+    """Блокування читачів і записувачів: читати можуть багато потоків одночасно, писати - лише один.
+
+    Записувач, що чекає, не пропускає вперед нових читачів, а після кожного запису спершу
+    входять читачі, які вже чекали, тож не голодують ні зміни, ні читання.
+    Потік, що вже тримає блокування, може взяти його ще раз (читання всередині запису,
+    вкладені читання чи записи), але перейти від читання до запису не може."""
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+        self._waiting_readers = 0
+        # Скільки читачів ще може увійти поза чергою записувачів: стільки, скільки їх
+        # чекало, коли записувач відпустив блокування
+        self._reader_quota = 0
+        self._local = threading.local()
+
+    def _read_depth(self):
+        return getattr(self._local, "depth", 0)
+
+    def acquire_read(self):
+        me = threading.get_ident()
+        depth = self._read_depth()
+        if self._writer == me or depth:
+            # Вкладене читання не чекає на записувачів, інакше потік заблокував би сам себе
+            self._local.depth = depth + 1
+            return
+        with self._condition:
+            self._waiting_readers += 1
+            try:
+                while self._writer is not None or (self._waiting_writers and not self._reader_quota):
+                    self._condition.wait()
+            finally:
+                self._waiting_readers -= 1
+            self._readers += 1
+            if self._reader_quota:
+                self._reader_quota -= 1
+        self._local.depth = 1
+
+    def release_read(self):
+        depth = self._read_depth()
+        self._local.depth = depth - 1
+        if depth > 1 or self._writer == threading.get_ident():
+            return
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            self._writer_depth += 1
+            return
+        if self._read_depth():
+            raise RuntimeError("Cannot take the write lock while holding the read lock.")
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers or self._reader_quota:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self):
+        self._writer_depth -= 1
+        if self._writer_depth:
+            return
+        with self._condition:
+            self._writer = None
+            self._reader_quota = self._waiting_readers
+            self._condition.notify_all()
+
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
@@ -0,0 +1,191 @@
+import asyncio # Імпортуємо asyncio для сервера, що обслуговує багато клієнтів в одному потоці
+import os # Імпортуємо os для видалення файлу Unix-сокета
+import threading # Імпортуємо threading, щоб вивід rich збирався окремо для кожного потоку
+from concurrent.futures import ThreadPoolExecutor # Імпортуємо ThreadPoolExecutor для окремого потоку записувача
+from .batch import ERROR_MARKS # Імпортуємо ERROR_MARKS, щоб відповіді з помилкою мали статус ERROR
+from .registry import get_command, execute_command, unknown_command, EXIT_COMMANDS # Імпортуємо реєстр команд
+from .utils import parse_input # Імпортуємо parse_input для розбору рядка команди
+
+SAVE_DELAY = 0.2 # Скільки секунд сервер чекає на наступні зміни, перш ніж зберегти їх разом
+SAVE_EVERY = 1000 # Після стількох змін книга зберігається, навіть якщо зміни не припиняються
+
+# Протокол: клієнт надсилає одну команду на рядок (UTF-8), сервер відповідає рядком
+# "<СТАТУС> <кількість рядків>" і далі самими рядками відповіді.
+# Статуси: OK, CHANGED (книгу змінено), ERROR, BYE (після exit сервер закриває з'єднання).
+
+# Адреса сервера: "unix:/шлях/до/сокета", "хост:порт" або лише порт (тоді хост 127.0.0.1)
+def parse_address(address):
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    if not port.isdigit():
+        raise ValueError(f"😓 Invalid server address '{address}'. Use 'unix:/path/to/socket', 'host:port' or a port.")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+def encode_reply(status, text):
+    lines = text.splitlines() if text else []
+    return (f"{status} {len(lines)}\n" + "".join(line + "\n" for line in lines)).encode("utf-8")
+
+
+class DeferredConsole:
+    """Консоль для all і help на сервері: print лише запам'ятовує таблиці й тексти свого потоку,
+    а перетворюються на рядки вони в render, коли команда вже відпустила блокування книги.
+    Таблиця на тисячі рядків малюється довго, і весь цей час інші команди не чекають."""
+
+    def __init__(self, console):
+        self.console = console
+        self._local = threading.local()
+
+    def print(self, *objects, **kwargs):
+        self._local.items.append((objects, kwargs))
+
+    # Починає збирати вивід команди в поточному потоці
+    def begin(self):
+        self._local.items = []
+
+    # Забирає зібраний вивід і повертає його текстом
+    def render(self):
+        items, self._local.items = self._local.items, []
+        with self.console.capture() as captured:
+            for objects, kwargs in items:
+                self.console.print(*objects, **kwargs)
+        return captured.get()
+
+
+class BookServer:
+    """Сервер, що обслуговує багатьох клієнтів з однієї адресної книги в пам'яті.
+
+    Цикл подій лише приймає команди, а виконуються вони в потоках під блокуванням книги:
+    команди читання - паралельно в пулі потоків, тож довгий export чи all не зупиняє
+    інших клієнтів. Команди, що змінюють книгу, йдуть через чергу до єдиного
+    завдання-записувача з окремим потоком, а воно зберігає зміни пачками:
+    коли черга затихає на save_delay секунд або після save_every змін."""
+
+    def __init__(self, book, storage, save_delay=SAVE_DELAY, save_every=SAVE_EVERY):
+        self.book = book
+        self.storage = storage
+        self.save_delay = save_delay
+        self.save_every = save_every
+        self.clients = 0
+        self._queue = None
+        self._writer_task = None
+        self._write_executor = None
+        self._unsaved = 0
+
+    # Виконує команду і повертає (статус, текст відповіді). Команди all і help друкують
+    # таблиці через rich, тому їхній вивід перехоплюється і надсилається клієнту;
+    # малюється він уже після того, як execute_command відпустив блокування книги.
+    def execute(self, command, args):
+        from . import display
+        display.console.begin()
+        result, changed = execute_command(command, args, self.book)
+        output = display.console.render()
+        if result is None:
+            return "ERROR", unknown_command(command)
+        result = (output + result).rstrip("\n")
+        if result.startswith(ERROR_MARKS):
+            return "ERROR", result
+        return ("CHANGED" if changed else "OK"), result
+
+    async def submit(self, command, args):
+        entry = get_command(command)
+        if entry is None or entry.read_only:
+            return await asyncio.get_running_loop().run_in_executor(None, self.execute, command, args)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((command, args, future))
+        return await future
+
+    # Єдине місце, де книга змінюється; збереження не блокує цикл подій
+    async def _writer(self):
+        while True:
+            try:
+                item = await asyncio.wait_for(self._queue.get(), self.save_delay if self._unsaved else None)
+            except asyncio.TimeoutError:
+                await self.save()
+                continue
+            if item is None:
+                await self.save()
+                return
+            command, args, future = item
+            try:
+                status, result = await asyncio.get_running_loop().run_in_executor(
+                    self._write_executor, self.execute, command, args)
+            except Exception as e:
+                status, result = "ERROR", f"😓 Something went wrong: {e}"
+            if status == "CHANGED":
+                self._unsaved += 1
+            if not future.cancelled():
+                future.set_result((status, result))
+            if self._unsaved >= self.save_every:
+                await self.save()
+
+    # Збереження йде в окремому потоці. Поки воно триває, записувач чекає, тож книгу
+    # ніхто не змінює, а команди, що лише читають, виконуються далі
+    async def save(self):
+        if not self._unsaved:
+            return
+        self._unsaved = 0
+        await asyncio.get_running_loop().run_in_executor(self._write_executor, self.storage.save, self.book)
+
+    async def handle_client(self, reader, writer):
+        self.clients += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                text = line.decode("utf-8", errors="replace").strip()
+                if not text:
+                    writer.write(encode_reply("ERROR", "😓 You didn’t enter anything! Please try again."))
+                elif parse_input(text)[0] in EXIT_COMMANDS:
+                    writer.write(encode_reply("BYE", "👋 Good bye!"))
+                    await writer.drain()
+                    break
+                else:
+                    writer.write(encode_reply(*await self.submit(*parse_input(text))))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    async def start(self, address):
+        from . import display, help
+        from rich.console import Console
+        # all і help друкують через ці консолі; для клієнтів це простий текст фіксованої ширини
+        display.console = help.console = DeferredConsole(Console(no_color=True, force_terminal=False, width=120))
+        # Команди йдуть з кількох потоків, тож книзі потрібне блокування читачів і записувачів
+        # (спільна книга вже має своє блокування файлу)
+        if self.book._lock is None:
+            self.book.enable_locking()
+        self._write_executor = ThreadPoolExecutor(1, thread_name_prefix="address-book-writer")
+        self._queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer())
+        kind, target = parse_address(address)
+        if kind == "unix":
+            if os.path.exists(target):
+                os.remove(target)
+            return await asyncio.start_unix_server(self.handle_client, path=target)
+        return await asyncio.start_server(self.handle_client, *target)
+
+    # Зупиняє записувача після всіх команд у черзі; останні зміни зберігаються
+    async def stop(self):
+        await self._queue.put(None)
+        await self._writer_task
+        self._write_executor.shutdown()
+
+
+async def serve(book, storage, address):
+    server = BookServer(book, storage)
+    listener = await server.start(address)
+    kind, target = parse_address(address)
+    print(f"📡 Serving '{storage.filename}' on {address}. Press Ctrl+C to stop.", flush=True)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        listener.close()
+        await server.stop()
+        if kind == "unix" and os.path.exists(target):
+            os.remove(target)
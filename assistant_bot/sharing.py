@@ -0,0 +1,92 @@
+import threading # Імпортуємо threading, щоб потоки одного процесу не заважали один одному
+from contextlib import contextmanager # Імпортуємо contextmanager для блоків with lock.read() / lock.write()
+try:
+    import fcntl # Імпортуємо fcntl для блокування файлу в Linux і macOS
+except ImportError:
+    fcntl = None
+    import msvcrt # Імпортуємо msvcrt для блокування файлу у Windows
+
+LOCK_SUFFIX = ".lock" # Файл блокування лежить поруч із книгою: address_book.pkl.lock
+
+
+class FileLock:
+    """Рекомендаційне блокування окремого файлу, спільне для всіх процесів бота.
+
+    Блокується окремий файл, а не сама книга, бо знімок книги замінюється новим файлом.
+    У Windows (msvcrt) спільного блокування немає, тож читання там теж ексклюзивне."""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = None
+
+    def acquire(self, exclusive=True):
+        if self._file is None:
+            self._file = open(self.filename, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            return
+        self._file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                # LK_LOCK здається приблизно через 10 секунд; чекаємо далі
+                continue
+
+    def release(self):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            return
+        self._file.seek(0)
+        msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SharedBookLock:
+    """Блокування книги, з якою працюють кілька процесів (встановлюється як book._lock).
+
+    На початку кожної команди береться блокування файлу і книга наздоганяє зміни інших
+    процесів (storage.refresh). Зміни зберігаються ще до того, як блокування відпускається,
+    тож процеси не перезаписують зміни один одного. Усередині процесу команди йдуть по черзі.
+    Інтерфейс такий самий, як у RWLock, тому registry і storage працюють з ним однаково."""
+
+    def __init__(self, storage, book):
+        self.storage = storage
+        self.book = book
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._exclusive = False
+
+    @contextmanager
+    def _hold(self, exclusive):
+        with self._thread_lock:
+            if self._depth == 0:
+                self.storage.file_lock.acquire(exclusive)
+                self._exclusive = exclusive
+                try:
+                    self.storage.refresh(self.book)
+                except BaseException:
+                    self.storage.file_lock.release()
+                    raise
+            elif exclusive and not self._exclusive:
+                raise RuntimeError("Cannot take the write lock while holding the read lock.")
+            self._depth += 1
+            try:
+                yield
+                if self._depth == 1 and self._exclusive and self.book._dirty:
+                    self.storage.save(self.book)
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.storage.file_lock.release()
+
+    def read(self):
+        return self._hold(False)
+
+    def write(self):
+        return self._hold(True)
@@ -0,0 +1,115 @@
+import gc # Імпортуємо gc, щоб вимкнути збирач сміття на час побудови каталогу
+import mmap # Імпортуємо mmap, щоб читати знімок з диска лише в тих місцях, які потрібні
+import os # Імпортуємо os для визначення операційної системи
+import pickle # Імпортуємо pickle для кодування окремих записів і каталогу
+import struct # Імпортуємо struct для заголовка файлу фіксованого розміру
+from .book import AddressBook, LazyRecords, restore_record # Імпортуємо класи книги для побудови ледачої книги
+
+# Формат знімка:
+#   заголовок  - SNAPSHOT_MAGIC, версія формату, зсув каталогу;
+#   записи     - кожен запис закодований окремо (pickle кортежу простих значень);
+#   каталог    - pickle списку (ключ, зсув, довжина, телефони) у порядку книги.
+# При завантаженні читається лише каталог, а кожен запис декодується при першому зверненні.
+SNAPSHOT_MAGIC = b"ABOOKSNP"
+SNAPSHOT_VERSION = 1
+HEADER = struct.Struct("<8sIQ")
+
+# Поточна версія запису і його поля після версії; старіші записи можуть не мати останніх полів
+RECORD_VERSION = 1
+RECORD_DEFAULTS = (None, (), None, None, None, ())  # name, phones, birthday, address, email, notes
+
+def is_snapshot(filename):
+    with open(filename, "rb") as file:
+        return file.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
+
+def encode_record(record):
+    return pickle.dumps((
+        RECORD_VERSION,
+        record.name.value,
+        tuple(phone.value for phone in record.phones),
+        record.birthday.value if record.birthday else None,
+        record.address.value if record.address else None,
+        record.email.value if record.email else None,
+        tuple((note.text, note.tags) for note in record.notes),
+    ), protocol=pickle.HIGHEST_PROTOCOL)
+
+# Міграція схеми відбувається тут, для кожного запису окремо: відсутні поля отримують типові значення
+def decode_record(payload):
+    version, *values = pickle.loads(payload)
+    if version > RECORD_VERSION:
+        raise ValueError(f"Record version {version} is newer than supported version {RECORD_VERSION}.")
+    values += RECORD_DEFAULTS[len(values):]
+    return restore_record(*values)
+
+# Кодує книгу у знімок; ще не прочитані записи копіюються з попереднього знімка без декодування
+def encode_snapshot(book):
+    data = book.data
+    reader = data.source if isinstance(data, LazyRecords) and isinstance(data.source, SnapshotReader) else None
+    chunks = []
+    directory = []
+    offset = HEADER.size
+    for key in data:
+        record = data.loaded(key) if reader is not None else data[key]
+        if record is None:
+            payload = reader.record_bytes(key)
+            phones = reader.phones(key)
+        else:
+            payload = encode_record(record)
+            phones = tuple(phone.value for phone in record.phones)
+        chunks.append(payload)
+        directory.append((key, offset, len(payload), phones))
+        offset += len(payload)
+    header = HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, offset)
+    return b"".join([header, *chunks, pickle.dumps(directory, protocol=pickle.HIGHEST_PROTOCOL)])
+
+# Windows не дає замінити файл, відображений у пам'ять, тож перед записом знімка книга читається повністю
+def release_snapshot(book):
+    if os.name == "nt" and isinstance(book.data, LazyRecords) and isinstance(book.data.source, SnapshotReader):
+        book.data.load_all()
+        book.data.source.close()
+
+# Каталог створює сотні тисяч дрібних об'єктів, і збирач сміття лише марно обходив би їх
+def load_snapshot(filename):
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        reader = SnapshotReader(filename)
+        phones = [(phone, key) for key, _, _, record_phones in reader.directory for phone in record_phones]
+        return AddressBook.from_source(reader, [entry[0] for entry in reader.directory], phones)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+class SnapshotReader:
+    """Читач знімка, відображеного в пам'ять: каталог читається одразу, записи - за запитом."""
+
+    def __init__(self, filename):
+        with open(filename, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, directory_offset = HEADER.unpack_from(self._map, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Not an address book snapshot.")
+        if version > SNAPSHOT_VERSION:
+            raise ValueError(f"Snapshot version {version} is newer than supported version {SNAPSHOT_VERSION}.")
+        self.directory = pickle.loads(self._map[directory_offset:])
+        self._entries = {entry[0]: entry for entry in self.directory}
+
+    def record_bytes(self, key):
+        _, offset, length, _ = self._entries[key]
+        return self._map[offset:offset + length]
+
+    def phones(self, key):
+        return self._entries[key][3]
+
+    def load_record(self, key):
+        return decode_record(self.record_bytes(key))
+
+    # Записи читаються в порядку файлу, тобто послідовно
+    def load_records(self, keys):
+        for key, _, _, _ in self.directory:
+            if key in keys:
+                yield key, self.load_record(key)
+
+    def close(self):
+        self._map.close()
@@ -0,0 +1,265 @@
+import os # Імпортуємо os для перевірки наявності файлів
+import sqlite3 # Імпортуємо sqlite3 для роботи з базою даних
+import threading # Імпортуємо threading, бо базою користуються і команди, і фоновий зберігач
+from .book import AddressBook, LazyRecords, restore_record # Імпортуємо AddressBook, LazyRecords і restore_record для побудови книги з рядків бази
+from .storage import Storage, read_address_book, report # Імпортуємо базовий інтерфейс сховища та читання файлу pickle для міграції
+
+SCHEMA_VERSION = 1
+LOAD_BATCH = 500 # Скільки ключів іде в один запит IN (...); SQLite обмежує кількість параметрів
+CACHE_SIZE = 10000 # Скільки прочитаних записів книга з бази тримає в пам'яті
+
+# Кожен контакт - рядок у contacts; телефони, нотатки і теги - в окремих таблицях з індексами.
+# Порядок книги - це порядок id, а порядок телефонів, нотаток і тегів зберігає position.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    birthday TEXT,
+    email TEXT,
+    address TEXT
+);
+CREATE INDEX IF NOT EXISTS contacts_name_nocase ON contacts (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS contacts_email ON contacts (email);
+CREATE TABLE IF NOT EXISTS phones (
+    contact_id INTEGER NOT NULL REFERENCES contacts (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    phone TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS phones_phone ON phones (phone);
+CREATE INDEX IF NOT EXISTS phones_contact ON phones (contact_id, position);
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    contact_id INTEGER NOT NULL REFERENCES contacts (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS notes_contact ON notes (contact_id, position);
+CREATE TABLE IF NOT EXISTS note_tags (
+    note_id INTEGER NOT NULL REFERENCES notes (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS note_tags_tag ON note_tags (tag);
+CREATE INDEX IF NOT EXISTS note_tags_note ON note_tags (note_id, position);
+"""
+
+# Файл pickle, з якого база заповнюється при першому запуску: address_book.db <- address_book.pkl
+def legacy_filename(filename):
+    return os.path.splitext(filename)[0] + ".pkl"
+
+
+class SqliteStorage(Storage):
+    """Сховище в SQLite: при запуску читаються лише імена та телефони, а записи - при першому зверненні."""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._connection = None
+        # Зміни з транзакції, яку довелося відкотити; вони пишуться знову з наступним збереженням
+        self._failed = []
+        # Одне з'єднання на процес; команди читають записи, а фоновий зберігач пише зміни
+        self._lock = threading.Lock()
+        # Записи книги з обмеженим кешем: після запису змін їх знову можна забувати
+        self._records = None
+
+    def _connect(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.filename, check_same_thread=False, isolation_level=None)
+            self._connection.execute("PRAGMA foreign_keys = ON")
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            if self._connection.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                self._connection.executescript(SCHEMA)
+                self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return self._connection
+
+    def load(self):
+        legacy = legacy_filename(self.filename)
+        if not os.path.exists(self.filename) and os.path.exists(legacy):
+            try:
+                return self.migrate(legacy)
+            except Exception as e:
+                report(f"😓 Error migrating '{legacy}' to '{self.filename}': {e}", style="red")
+                report(f"'{legacy}' is left as it is; starting with an empty address book.", style="yellow")
+                return AddressBook()
+        try:
+            with self._lock:
+                connection = self._connect()
+                keys = [name for name, in connection.execute("SELECT name FROM contacts ORDER BY id")]
+                phones = connection.execute(
+                    "SELECT phones.phone, contacts.name FROM phones JOIN contacts ON contacts.id = phones.contact_id "
+                    "ORDER BY phones.contact_id, phones.position"
+                ).fetchall()
+        except Exception as e:
+            report(f"😓 Error loading address book from '{self.filename}': {e}", style="red")
+            report("Creating a new empty address book instead.", style="yellow")
+            return AddressBook()
+        return AddressBook.from_source(self, keys, phones, cache_size=CACHE_SIZE)
+
+    # Одноразове перенесення книги з файлу pickle (разом із журналом) у нову базу.
+    # База заповнюється під тимчасовим ім'ям і з'являється лише готовою, тож перерване
+    # перенесення не лишає порожньої бази і наступний запуск спробує ще раз.
+    def migrate(self, pickle_filename):
+        book, _ = read_address_book(pickle_filename, strict=True)
+        for key in book.data:
+            book._dirty[key] = "add"
+        tmp_filename = self.filename + ".tmp"
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(tmp_filename + suffix):
+                os.remove(tmp_filename + suffix)
+        target = SqliteStorage(tmp_filename)
+        try:
+            target.write_prepared(target.prepare_save(book))
+        except Exception as e:
+            # Книгу прочитано, тож працювати можна; її запише в базу наступне збереження
+            for key in book.data:
+                book._dirty[key] = "add"
+            report(f"😓 Error migrating '{pickle_filename}' to '{self.filename}': {e}", style="red")
+            return book
+        finally:
+            target.close()
+        os.replace(tmp_filename, self.filename)
+        report(f"📦 Migrated {len(book)} contacts from '{pickle_filename}' to '{self.filename}'.", style="green")
+        return book
+
+    # Читання одного запису за ключем
+    def load_record(self, key):
+        with self._lock:
+            connection = self._connect()
+            contact_id, name, birthday, email, address = connection.execute(
+                "SELECT id, name, birthday, email, address FROM contacts WHERE name = ?", (key,)
+            ).fetchone()
+            phones = [phone for phone, in connection.execute(
+                "SELECT phone FROM phones WHERE contact_id = ? ORDER BY position", (contact_id,)
+            )]
+            notes = {}
+            for note_id, text in connection.execute(
+                "SELECT id, text FROM notes WHERE contact_id = ? ORDER BY position", (contact_id,)
+            ):
+                notes[note_id] = (text, [])
+            for note_id, tag in connection.execute(
+                "SELECT note_tags.note_id, note_tags.tag FROM note_tags JOIN notes ON notes.id = note_tags.note_id "
+                "WHERE notes.contact_id = ? ORDER BY note_tags.note_id, note_tags.position", (contact_id,)
+            ):
+                notes[note_id][1].append(tag)
+        return restore_record(name, phones, birthday, address, email, notes.values())
+
+    # Читання багатьох записів: ключі йдуть у базу частинами по LOAD_BATCH, тож у пам'яті
+    # одночасно лише рядки однієї частини, а не вся база
+    def load_records(self, keys):
+        keys = list(keys)
+        for start in range(0, len(keys), LOAD_BATCH):
+            yield from self._load_batch(keys[start:start + LOAD_BATCH])
+
+    def _load_batch(self, keys):
+        marks = ", ".join("?" * len(keys))
+        with self._lock:
+            connection = self._connect()
+            contacts = {}
+            for contact_id, name, birthday, email, address in connection.execute(
+                f"SELECT id, name, birthday, email, address FROM contacts WHERE name IN ({marks}) ORDER BY id", keys
+            ):
+                contacts[contact_id] = (name, birthday, email, address)
+            if not contacts:
+                return
+            ids = list(contacts)
+            id_marks = ", ".join("?" * len(ids))
+            phones = {}
+            for contact_id, phone in connection.execute(
+                f"SELECT contact_id, phone FROM phones WHERE contact_id IN ({id_marks}) ORDER BY contact_id, position", ids
+            ):
+                phones.setdefault(contact_id, []).append(phone)
+            notes = {}
+            note_texts = {}
+            for note_id, contact_id, text in connection.execute(
+                f"SELECT id, contact_id, text FROM notes WHERE contact_id IN ({id_marks}) ORDER BY contact_id, position", ids
+            ):
+                note_texts[note_id] = (text, [])
+                notes.setdefault(contact_id, []).append(note_texts[note_id])
+            for note_id, tag in connection.execute(
+                "SELECT note_tags.note_id, note_tags.tag FROM note_tags JOIN notes ON notes.id = note_tags.note_id "
+                f"WHERE notes.contact_id IN ({id_marks}) ORDER BY note_tags.note_id, note_tags.position", ids
+            ):
+                note_texts[note_id][1].append(tag)
+        # Записи будуються вже без блокування бази
+        for contact_id, (name, birthday, email, address) in contacts.items():
+            yield name, restore_record(name, phones.get(contact_id, ()), birthday, address, email,
+                                       notes.get(contact_id, ()))
+
+    # Знімає значення змінених записів; зміни пишуться пізніше, поза блокуванням книги
+    def prepare_save(self, book):
+        changes, self._failed = self._failed, []
+        for key, op in book._dirty.items():
+            if op == "del":
+                changes.append((op, key, None))
+                continue
+            record = book.data[key]
+            changes.append((op, key, (
+                record.birthday.value if record.birthday else None,
+                record.email.value if record.email else None,
+                record.address.value if record.address else None,
+                [phone.value for phone in record.phones],
+                [(note.text, note.tags) for note in record.notes],
+            )))
+        book._dirty.clear()
+        if isinstance(book.data, LazyRecords):
+            self._records = book.data
+        return changes
+
+    # Усі зміни пишуться однією транзакцією
+    def write_prepared(self, prepared):
+        if not prepared:
+            return False
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN")
+            try:
+                for op, key, values in prepared:
+                    self._write_change(connection, op, key, values)
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                self._failed = prepared + self._failed
+                raise
+        # Поза блокуванням бази, бо читання запису бере спершу блокування записів, а потім бази
+        if self._records is not None:
+            self._records.release(key for op, key, _ in prepared if op != "del")
+        return False
+
+    def _write_change(self, connection, op, key, values):
+        # Новий запис іде в кінець книги, тож старий рядок з тим самим ім'ям видаляється
+        if op in ("del", "add"):
+            connection.execute("DELETE FROM contacts WHERE name = ?", (key,))
+            if op == "del":
+                return
+        birthday, email, address, phones, notes = values
+        row = connection.execute("SELECT id FROM contacts WHERE name = ?", (key,)).fetchone()
+        if row is None:
+            contact_id = connection.execute(
+                "INSERT INTO contacts (name, birthday, email, address) VALUES (?, ?, ?, ?)",
+                (key, birthday, email, address),
+            ).lastrowid
+        else:
+            contact_id = row[0]
+            connection.execute(
+                "UPDATE contacts SET birthday = ?, email = ?, address = ? WHERE id = ?",
+                (birthday, email, address, contact_id),
+            )
+            connection.execute("DELETE FROM phones WHERE contact_id = ?", (contact_id,))
+            connection.execute("DELETE FROM notes WHERE contact_id = ?", (contact_id,))
+        connection.executemany(
+            "INSERT INTO phones (contact_id, position, phone) VALUES (?, ?, ?)",
+            [(contact_id, position, phone) for position, phone in enumerate(phones)],
+        )
+        for position, (text, tags) in enumerate(notes):
+            note_id = connection.execute(
+                "INSERT INTO notes (contact_id, position, text) VALUES (?, ?, ?)", (contact_id, position, text)
+            ).lastrowid
+            connection.executemany(
+                "INSERT INTO note_tags (note_id, position, tag) VALUES (?, ?, ?)",
+                [(note_id, tag_position, tag) for tag_position, tag in enumerate(tags)],
+            )
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,132 @@
+import json # Імпортуємо json для запису статистики у файл
+import math # Імпортуємо math для логарифмічних кошиків гістограми
+import threading # Імпортуємо threading, бо збереження рахуються і у фоновому потоці
+from .utils import split_options # Імпортуємо split_options для розбору опцій команди stats
+
+# Статистика вмикається явно (main.py --stats або --stats-file); вимкнена, вона коштує одну перевірку на команду
+enabled = False
+
+
+class Histogram:
+    """Гістограма часу з логарифмічними кошиками: пам'ять не росте з кількістю замірів.
+
+    Кошики ростуть у GROWTH разів, тож перцентиль оцінюється з точністю до ~10%."""
+
+    MIN_SECONDS = 1e-6
+    GROWTH = 1.1
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds):
+        bucket = max(0, int(math.log(max(seconds, self.MIN_SECONDS) / self.MIN_SECONDS, self.GROWTH)))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+
+    # Верхня межа кошика, в який потрапляє частка q усіх замірів
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        needed = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= needed:
+                return self.MIN_SECONDS * self.GROWTH ** (bucket + 1)
+        return self.MIN_SECONDS * self.GROWTH ** (max(self.buckets) + 1)
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "p50_ms": round(self.percentile(0.50) * 1000, 3),
+            "p95_ms": round(self.percentile(0.95) * 1000, 3),
+            "p99_ms": round(self.percentile(0.99) * 1000, 3),
+        }
+
+
+_lock = threading.Lock()
+_commands = {}  # команда -> Histogram
+_errors = {}  # команда -> {категорія помилки: кількість}
+_saves = Histogram()
+
+def enable():
+    global enabled
+    enabled = True
+
+def reset():
+    global _saves
+    with _lock:
+        _commands.clear()
+        _errors.clear()
+        _saves = Histogram()
+
+# Записує один виклик команди; error - категорія помилки з input_error або None
+def record_command(command, seconds, error=None):
+    with _lock:
+        histogram = _commands.get(command)
+        if histogram is None:
+            histogram = _commands[command] = Histogram()
+        histogram.add(seconds)
+        if error is not None:
+            errors = _errors.setdefault(command, {})
+            errors[error] = errors.get(error, 0) + 1
+
+def record_save(seconds):
+    with _lock:
+        _saves.add(seconds)
+
+def snapshot():
+    with _lock:
+        return {
+            "commands": {
+                command: dict(histogram.summary(), errors=dict(_errors.get(command, {})))
+                for command, histogram in _commands.items()
+            },
+            "saves": _saves.summary(),
+        }
+
+def dump(filename):
+    with open(filename, "w", encoding="utf-8") as file:
+        json.dump(snapshot(), file, indent=2)
+
+def format_stats(data):
+    if not data["commands"] and not data["saves"]["count"]:
+        return "📈 No commands recorded yet."
+    lines = ["📈 Command statistics (calls, p50/p95/p99 in ms, errors):"]
+    width = max((len(command) for command in data["commands"]), default=0)
+    for command, summary in sorted(data["commands"].items(), key=lambda item: -item[1]["total_ms"]):
+        errors = ", ".join(f"{category} {count}" for category, count in sorted(summary["errors"].items()))
+        lines.append(
+            f"  {command:<{width}}  {summary['count']:>6}  "
+            f"{summary['p50_ms']:>9.3f} {summary['p95_ms']:>9.3f} {summary['p99_ms']:>9.3f}"
+            + (f"  ⚠️ {errors}" if errors else "")
+        )
+    saves = data["saves"]
+    lines.append(
+        f"💾 Saves: {saves['count']}, total {saves['total_ms']:.3f} ms, "
+        f"p50 {saves['p50_ms']:.3f} ms, p95 {saves['p95_ms']:.3f} ms, p99 {saves['p99_ms']:.3f} ms"
+    )
+    return "\n".join(lines)
+
+# Обробник команди stats: stats [reset] [--dump FILE]. Сам він у статистику не потрапляє.
+def stats_command(args, book, command="stats"):
+    from .registry import error_message
+    if not enabled:
+        return "😓 Statistics are off. Start the bot with '--stats' to collect them."
+    try:
+        args, options = split_options(args)
+    except ValueError as e:
+        return str(e)
+    if args == ["reset"]:
+        reset()
+        return "✅ Statistics reset."
+    if args or set(options) - {"dump"}:
+        return error_message(command)
+    if "dump" in options:
+        dump(options["dump"])
+        return f"📄 Statistics written to '{options['dump']}'."
+    return format_stats(snapshot())
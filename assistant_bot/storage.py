@@ -1,32 +1,361 @@
 import pickle # Імпортуємо pickle для серіалізації та десеріалізації об'єктів
 import os # Імпортуємо os для роботи з файловою системою
+import threading # Імпортуємо threading для фонового збереження
+import time # Імпортуємо time для затримки, що об'єднує серію змін
+from contextlib import contextmanager # Імпортуємо contextmanager для блокування, під яким зберігач читає книгу
 from .book import AddressBook # Імпортуємо AddressBook з book.py для роботи з адресною книгою
+from . import stats # Імпортуємо stats, щоб рахувати час збережень
+from .snapshot import encode_snapshot, is_snapshot, load_snapshot, release_snapshot # Імпортуємо формат знімка з ледачим читанням записів
 
 DEFAULT_FILENAME = "address_book.pkl"
+JOURNAL_SUFFIX = ".journal" # Журнал змін зберігається поруч зі знімком: address_book.pkl.journal
+JOURNAL_COMPACT_SIZE = 1024 * 1024 # Після цього розміру (в байтах) журнал згортається у знімок
 
+# rich імпортується лише тоді, коли є що повідомити, щоб не сповільнювати запуск
+def report(message, style="red"):
+    from rich.console import Console
+    Console().print(message, style=style)
+
+def journal_filename(filename):
+    return filename + JOURNAL_SUFFIX
+
+# Зберігає лише змінені записи: дописує їх у журнал, а не перезаписує весь файл
 def save_address_book(book, filename=DEFAULT_FILENAME):
-    try:
-        with open(filename, "wb") as file:
-            pickle.dump(book, file)
-    except Exception as e:
-        console.print(f"😓 Error saving address book to '{filename}': {e}", style="red")
+    PickleStorage(filename).save(book)
+
+# Записує повний знімок книги і очищає журнал
+def compact_address_book(book, filename=DEFAULT_FILENAME):
+    write_snapshot(prepare_snapshot(book, filename), filename)
+
+# Серіалізує зміни книги; це єдиний крок, якому потрібен доступ до книги
+def prepare_save(book, filename=DEFAULT_FILENAME):
+    if book._synced_file != filename or not os.path.exists(filename):
+        return "snapshot", prepare_snapshot(book, filename)
+    data = journal_entries(book)
+    book._dirty.clear()
+    return "journal", data
+
+def prepare_snapshot(book, filename=DEFAULT_FILENAME):
+    release_snapshot(book)
+    data = encode_snapshot(book)
+    book._dirty.clear()
+    book._synced_file = filename
+    return data
+
+# Записує підготовлені дані на диск; повертає True, якщо журнал час згорнути у знімок
+def write_prepared(filename, mode, data):
+    if mode == "snapshot":
+        write_snapshot(data, filename)
+        return False
+    append_journal(data, filename)
+    journal = journal_filename(filename)
+    return os.path.exists(journal) and os.path.getsize(journal) > JOURNAL_COMPACT_SIZE
+
+# Атомарний запис знімка: тимчасовий файл, fsync і перейменування поверх старого
+def write_snapshot(data, filename=DEFAULT_FILENAME):
+    tmp_filename = filename + ".tmp"
+    with open(tmp_filename, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_filename, filename)
+    if os.name == "posix":
+        dir_fd = os.open(os.path.dirname(os.path.abspath(filename)), os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    # Журнал видаляється лише після того, як новий знімок уже на диску
+    journal = journal_filename(filename)
+    if os.path.exists(journal):
+        os.remove(journal)
+
+# Серіалізує по одному запису журналу на кожен змінений контакт
+def journal_entries(book):
+    entries = []
+    for key, op in book._dirty.items():
+        record = book.data.get(key) if op != "del" else None
+        entries.append(pickle.dumps((op, key, record)))
+    return b"".join(entries)
+
+def append_journal(data, filename=DEFAULT_FILENAME):
+    if not data:
+        return
+    with open(journal_filename(filename), "ab") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+
+# Застосовує журнал до завантаженого знімка, починаючи з байта offset; обірваний хвіст журналу
+# відкидається. Застосовані записи не вважаються зміненими. Повертає, до якого байта дочитано журнал.
+def replay_journal(book, filename=DEFAULT_FILENAME, offset=0):
+    journal = journal_filename(filename)
+    if not os.path.exists(journal):
+        return 0
+    dirty = dict(book._dirty)
+    with open(journal, "rb") as file:
+        file.seek(offset)
+        good_offset = offset
+        while True:
+            try:
+                op, key, record = pickle.load(file)
+            except EOFError:
+                break
+            except Exception:
+                report(f"😓 Journal '{journal}' is damaged after byte {good_offset}, ignoring the rest.", style="yellow")
+                break
+            if op == "del":
+                if key in book.data:
+                    del book[key]
+            else:
+                if op == "add" and key in book.data:
+                    del book[key]
+                book[key] = record
+            good_offset = file.tell()
+    book._dirty = dirty
+    if good_offset < os.path.getsize(journal):
+        with open(journal, "r+b") as file:
+            file.truncate(good_offset)
+    return good_offset
 
 def load_address_book(filename=DEFAULT_FILENAME):
+    return read_address_book(filename)[0]
+
+# Завантажує книгу і повертає (книга, до якого байта прочитано журнал).
+# Зі strict=True помилка читання не замінюється порожньою книгою, а передається далі
+def read_address_book(filename=DEFAULT_FILENAME, strict=False):
     if os.path.exists(filename):
         try:
-            with open(filename, "rb") as file:
-                book = pickle.load(file)
-                for record in book.values():
-                    if not hasattr(record, "address"):
-                        record.address = None
-                    if not hasattr(record, "email"):
-                        record.email = None
-                    if not hasattr(record, "notes"):
-                        record.notes = []
-                return book
+            # Старі файли містять усю книгу одним pickle; перше ж збереження перепише їх у новому форматі
+            legacy = not is_snapshot(filename)
+            if legacy:
+                with open(filename, "rb") as file:
+                    book = pickle.load(file)
+            else:
+                book = load_snapshot(filename)
+            offset = replay_journal(book, filename)
+            book._dirty.clear()
+            book._synced_file = None if legacy else filename
+            return book, offset
         except Exception as e:
-            console.print(f"😓 Error loading address book from '{filename}': {e}", style="red")
-            console.print("Creating a new empty address book instead.", style="yellow")
-            return AddressBook()
-    return AddressBook()
+            if strict:
+                raise
+            report(f"😓 Error loading address book from '{filename}': {e}", style="red")
+            report("Creating a new empty address book instead.", style="yellow")
+            return AddressBook(), 0
+    return AddressBook(), 0
+
+# Ознака версії файлу: новий знімок - це новий файл (os.replace), тож змінюється хоча б одне з полів
+def file_identity(filename):
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+# Єдина послідовність збереження: дані готуються під блокуванням книги (hold, за
+# замовчуванням book.writing), запис у файл іде без нього, а за потреби сховище стискається.
+# Якщо щось не вдалося, сховище дізнається про це, щоб наступного разу записати книгу повністю.
+def save_book(storage, book, hold=None):
+    hold = hold or book.writing
+    start = time.perf_counter()
+    try:
+        with hold():
+            prepared = storage.prepare_save(book)
+        if storage.write_prepared(prepared):
+            with hold():
+                prepared = storage.prepare_compact(book)
+            storage.write_compact(prepared)
+    except Exception as e:
+        with hold():
+            storage.save_failed(book)
+        report(f"😓 Error saving address book to '{storage.filename}': {e}", style="red")
+    if stats.enabled:
+        stats.record_save(time.perf_counter() - start)
+
+
+class Storage:
+    """Базовий інтерфейс сховища адресної книги.
+
+    Збереження ділиться на два кроки: prepare_save читає книгу (під її блокуванням),
+    а write_prepared пише підготовлені дані і вже не торкається книги."""
+
+    filename = None
+    # Спільна книга (кілька процесів): будь-яке збереження має йти через save()
+    shared = False
+
+    def load(self):
+        raise NotImplementedError
+
+    # Підтягує зміни, зроблені іншими процесами (лише для спільної книги)
+    def refresh(self, book):
+        pass
+
+    def prepare_save(self, book):
+        raise NotImplementedError
+
+    # Повертає True, якщо після запису сховище варто стиснути
+    def write_prepared(self, prepared):
+        raise NotImplementedError
+
+    def prepare_compact(self, book):
+        return None
+
+    def write_compact(self, prepared):
+        pass
+
+    # Викликається, коли збереження не вдалося, щоб наступне записало книгу повністю
+    def save_failed(self, book):
+        pass
+
+    def save(self, book):
+        save_book(self, book)
+
+    def close(self):
+        pass
+
+
+class PickleStorage(Storage):
+    """Сховище у файлі pickle зі знімком книги та журналом змін.
+
+    Зі shared=True книгою можуть користуватися кілька процесів: кожна команда йде під
+    блокуванням файлу (sharing.py), спершу дочитуючи чужі зміни. Якщо знімок замінено,
+    книга перечитується повністю, а якщо лише дописано журнал - застосовується тільки новий хвіст."""
+
+    def __init__(self, filename=DEFAULT_FILENAME, shared=False):
+        self.filename = filename
+        self.shared = shared
+        self.file_lock = None
+        # Яку версію знімка і скільки байтів журналу вже містить книга в пам'яті
+        self._snapshot_id = None
+        self._journal_offset = 0
+
+    def load(self):
+        if not self.shared:
+            return load_address_book(self.filename)
+        from .sharing import FileLock, SharedBookLock, LOCK_SUFFIX
+        self.file_lock = FileLock(self.filename + LOCK_SUFFIX)
+        book = AddressBook()
+        book._lock = SharedBookLock(self, book)
+        # Перше блокування побачить, що знімок ще не прочитано, і завантажить книгу
+        self._snapshot_id = False
+        with book.reading():
+            pass
+        return book
+
+    def refresh(self, book):
+        snapshot_id = file_identity(self.filename)
+        journal = journal_filename(self.filename)
+        journal_size = os.path.getsize(journal) if os.path.exists(journal) else 0
+        if snapshot_id != self._snapshot_id or journal_size < self._journal_offset:
+            fresh, self._journal_offset = read_address_book(self.filename)
+            book._replace_contents(fresh)
+            self._snapshot_id = snapshot_id
+        elif journal_size > self._journal_offset:
+            self._journal_offset = replay_journal(book, self.filename, self._journal_offset)
+
+    # Для спільної книги збереження йде під блокуванням файлу разом із дочитуванням чужих змін
+    def save(self, book):
+        if not self.shared:
+            return Storage.save(self, book)
+        with book.writing():
+            Storage.save(self, book)
+
+    def prepare_save(self, book):
+        return prepare_save(book, self.filename)
+
+    def write_prepared(self, prepared):
+        mode, data = prepared
+        compact = write_prepared(self.filename, mode, data)
+        self._mark_synced()
+        return compact
+
+    def prepare_compact(self, book):
+        return prepare_snapshot(book, self.filename)
+
+    def write_compact(self, prepared):
+        write_snapshot(prepared, self.filename)
+        self._mark_synced()
+
+    # Після власного запису (під блокуванням файлу) книга відповідає файлам на диску
+    def _mark_synced(self):
+        if self.shared:
+            journal = journal_filename(self.filename)
+            self._snapshot_id = file_identity(self.filename)
+            self._journal_offset = os.path.getsize(journal) if os.path.exists(journal) else 0
+
+    def save_failed(self, book):
+        book._synced_file = None
+
+    def close(self):
+        if self.file_lock is not None:
+            self.file_lock.close()
+
+
+# Файли з цими розширеннями зберігаються в SQLite, усі інші - у pickle
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+# shared вмикає спільну роботу кількох процесів з однією книгою pickle (для SQLite не підтримується)
+def open_storage(filename=DEFAULT_FILENAME, shared=False):
+    if filename.endswith(SQLITE_SUFFIXES):
+        from .sqlite_storage import SqliteStorage
+        return SqliteStorage(filename)
+    return PickleStorage(filename, shared)
+
+
+class BackgroundSaver:
+    """Клас для фонового збереження адресної книги, що об'єднує серію змін в один запис."""
+
+    def __init__(self, book, storage, delay=0.2):
+        self.book = book
+        self.storage = storage
+        self.delay = delay
+        # Блокування книги: його тримають команди під час змін і зберігач під час серіалізації
+        self.lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._pending = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="address-book-saver", daemon=True)
+        self._thread.start()
+
+    # Метод для запиту збереження після зміни книги
+    def schedule(self):
+        self._pending.set()
+
+    # Метод для негайного збереження всіх змін
+    def flush(self):
+        self._pending.clear()
+        self._save()
+
+    # Метод для зупинки фонового потоку із фінальним збереженням
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._pending.set()
+        self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while not self._closed:
+            self._pending.wait()
+            if self._closed:
+                return
+            time.sleep(self.delay)
+            self._pending.clear()
+            self._save()
+
+    def _save(self):
+        with self._write_lock:
+            if self.storage.shared:
+                with self.lock:
+                    self.storage.save(self.book)
+                return
+            save_book(self.storage, self.book, self._hold)
 
+    # Зберігач читає книгу під своїм блокуванням і блокуванням самої книги
+    @contextmanager
+    def _hold(self):
+        with self.lock, self.book.writing():
+            yield
@@ -1,5 +1,4 @@
 import re # Імпортуємо re для роботи з регулярними виразами
-import difflib # Імпортуємо difflib для пошуку схожих рядків
 
 def normalize_name(name):
     def fix_part(part):
@@ -18,9 +17,12 @@ def format_address(address: str) -> str:
 
     return " ".join(formatted)
 
-def suggest_command(input_cmd, valid_commands):
-        
-    prefix_matches = [cmd for cmd in valid_commands if cmd.startswith(input_cmd)]
+# prefix_matches - команди, що починаються з input_cmd, якщо їх уже знайдено (наприклад, деревом префіксів)
+def suggest_command(input_cmd, valid_commands, prefix_matches=None):
+    import difflib # difflib потрібен лише для невідомих команд, тож імпортуємо його тут
+
+    if prefix_matches is None:
+        prefix_matches = [cmd for cmd in valid_commands if cmd.startswith(input_cmd)]
 
     if prefix_matches:
         return f"🤔 Did you mean one of these commands: {', '.join(f'\'{cmd}\'' for cmd in prefix_matches)}? Please try again!"
@@ -38,6 +40,23 @@ def suggest_command(input_cmd, valid_commands):
 def extract_tags_from_text(text):
     return [tag[1:].lower() for tag in re.findall(r"#\w+", text)]
 
+# Відокремлює опції виду "--limit 5" від решти аргументів команди
+def split_options(args):
+    positional = []
+    options = {}
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg.startswith("--") and len(arg) > 2:
+            if i + 1 >= len(args):
+                raise ValueError(f"😓 Option '{arg}' needs a value.")
+            options[arg[2:].lower()] = args[i + 1]
+            i += 2
+        else:
+            positional.append(arg)
+            i += 1
+    return positional, options
+
 def parse_input(user_input):
     cmd, *args = user_input.strip().split()
     return cmd.strip().lower(), args
@@ -0,0 +1,113 @@
+import random # Імпортуємо random для відтворюваної генерації даних
+from datetime import date, timedelta # Імпортуємо date і timedelta для випадкових днів народження
+from assistant_bot.book import AddressBook, Phone, restore_record # Імпортуємо класи книги та коди операторів
+
+FIRST_NAMES = [
+    "Ivan", "Olga", "Petro", "Mariia", "Andrii", "Oksana", "Taras", "Iryna", "Dmytro", "Nataliia",
+    "Serhii", "Olena", "Mykola", "Yuliia", "Oleksandr", "Kateryna", "Volodymyr", "Tetiana", "Bohdan", "Sofiia",
+    "Yaroslav", "Anastasiia", "Roman", "Viktoriia", "Vasyl", "Halyna", "Maksym", "Daryna", "Artem", "Khrystyna",
+]
+LAST_NAMES = [
+    "Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko", "Kravchenko", "Boiko", "Melnyk", "Oliinyk", "Lysenko", "Koval",
+    "Moroz", "Marchenko", "Savchenko", "Rudenko", "Petrenko", "Kozak", "Pavlenko", "Ponomarenko", "Levchenko", "Kharchenko",
+    "Hnatiuk", "Sydorenko", "Kuzmenko", "Vasylenko", "Klymenko", "Polishchuk", "Tkachuk", "Romaniuk", "Ivanenko", "Zinchenko",
+]
+STREETS = [
+    "vul. Khreshchatyk", "vul. Shevchenka", "vul. Franka", "vul. Lesi Ukrainky", "prosp. Peremohy",
+    "vul. Sadova", "vul. Vilna", "vul. Soborna", "vul. Hrushevskoho", "vul. Mazepy",
+]
+CITIES = ["Kyiv", "Lviv", "Kharkiv", "Odesa", "Dnipro", "Vinnytsia", "Poltava", "Chernihiv", "Uzhhorod", "Lutsk"]
+NOTE_WORDS = [
+    "call", "meeting", "project", "invoice", "birthday", "gift", "report", "review", "lunch", "trip",
+    "plan", "budget", "contract", "deadline", "client", "update", "reminder", "order", "payment", "design",
+    "draft", "agenda", "feedback", "schedule", "ticket", "delivery", "proposal", "training", "demo", "visit",
+]
+TAGS = [
+    "work", "family", "urgent", "later", "friends", "project", "finance", "travel", "health", "shopping",
+    "ideas", "home", "study", "sport", "music", "books", "car", "garden", "kids", "events",
+]
+EMAIL_DOMAINS = ["gmail.com", "ukr.net", "i.ua", "meta.ua", "example.com"]
+
+
+# Суфікс з літер для унікальності імен (цифри в імені сплутались би з телефоном у командах)
+def letters(number):
+    result = ""
+    while True:
+        number, rest = divmod(number, 26)
+        result = chr(ord("a") + rest) + result
+        if number == 0:
+            return result.capitalize()
+        number -= 1
+
+
+class BookGenerator:
+    """Генератор синтетичних адресних книг з валідними телефонами, датами та тегами.
+
+    Телефони та імена ніколи не повторюються: генератор пам'ятає лише лічильники, тож
+    його можна використовувати і для нових значень у командах бенчмарку."""
+
+    def __init__(self, seed=0, phones=(1, 3), notes=(0, 3), tags=(0, 3),
+                 birthday_share=0.8, email_share=0.6, address_share=0.5):
+        self.rng = random.Random(seed)
+        self.phones = phones
+        self.notes = notes
+        self.tags = tags
+        self.birthday_share = birthday_share
+        self.email_share = email_share
+        self.address_share = address_share
+        self._next_name = 0
+        self._next_phone = 0
+        self._first_birthday = date(1930, 1, 1)
+        self._birthday_days = (date.today() - timedelta(days=365) - self._first_birthday).days
+
+    def name(self):
+        number = self._next_name
+        self._next_name += 1
+        first = FIRST_NAMES[number % len(FIRST_NAMES)]
+        last = LAST_NAMES[(number // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        return f"{first} {last} {letters(number)}"
+
+    # Номер з валідним кодом оператора; сім останніх цифр унікальні для кожного номера
+    def phone(self):
+        number = self._next_phone
+        self._next_phone += 1
+        return f"{self.rng.choice(Phone.VALID_CODES)}{number:07d}"
+
+    def birthday(self):
+        return (self._first_birthday + timedelta(days=self.rng.randrange(self._birthday_days))).strftime("%d.%m.%Y")
+
+    def email(self, name):
+        login = ".".join(name.lower().split()[:2])
+        return f"{login}{self.rng.randrange(1000)}@{self.rng.choice(EMAIL_DOMAINS)}"
+
+    def address(self):
+        return f"{self.rng.choice(STREETS)} {self.rng.randrange(1, 200)}, {self.rng.choice(CITIES)}"
+
+    def note_text(self):
+        return " ".join(self.rng.choice(NOTE_WORDS) for _ in range(self.rng.randint(2, 6)))
+
+    def note_tags(self):
+        return tuple(self.rng.sample(TAGS, self.rng.randint(*self.tags)))
+
+    def record(self):
+        name = self.name()
+        phones = [self.phone() for _ in range(self.rng.randint(*self.phones))]
+        birthday = self.birthday() if self.rng.random() < self.birthday_share else None
+        address = self.address() if self.rng.random() < self.address_share else None
+        email = self.email(name) if self.rng.random() < self.email_share else None
+        notes = {}
+        for _ in range(self.rng.randint(*self.notes)):
+            notes.setdefault(self.note_text(), self.note_tags())
+        return restore_record(name, phones, birthday, address, email, notes.items())
+
+    # Нова книга з contacts записами; вона вважається щойно збереженою (без змінених записів)
+    def book(self, contacts):
+        book = AddressBook()
+        for _ in range(contacts):
+            book.add_record(self.record())
+        book._dirty.clear()
+        return book
+
+
+def generate_book(contacts, seed=0, **options):
+    return BookGenerator(seed, **options).book(contacts)
@@ -0,0 +1,298 @@
+import argparse # Імпортуємо argparse для параметрів запуску бенчмарку
+import json # Імпортуємо json для машинночитного файлу результатів
+import os # Імпортуємо os для тимчасових файлів сховища
+import platform # Імпортуємо platform, щоб записати, на чому виконувались заміри
+import statistics # Імпортуємо statistics для медіани
+import sys # Імпортуємо sys для версії Python і виведення звіту
+import tempfile # Імпортуємо tempfile для каталогу з файлами сховища
+import time # Імпортуємо time для вимірювання часу
+from assistant_bot.registry import get_command, command_names as registry_names # Імпортуємо реєстр, щоб викликати обробники команд з commands.py
+from assistant_bot.batch import ERROR_MARKS # Імпортуємо ERROR_MARKS, щоб помилка команди не видавалась за швидку відповідь
+from assistant_bot.storage import save_address_book, load_address_book, open_storage # Імпортуємо функції сховища
+from .generator import BookGenerator, LAST_NAMES, NOTE_WORDS, TAGS # Імпортуємо генератор синтетичних книг
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_REPEAT = 5
+
+
+class BenchmarkError(Exception):
+    """Команда в замірі відповіла помилкою, тож її час нічого не означає."""
+
+
+# Випадковий запис книги, для якого виконується умова (або будь-який, якщо такого не знайшлося)
+def pick(book, keys, rng, predicate=None, attempts=50):
+    record = None
+    for _ in range(attempts):
+        key = rng.choice(keys)
+        if key not in book.data:
+            continue
+        record = book.data[key]
+        if predicate is None or predicate(record):
+            return record
+    return record
+
+class CommandScenarios:
+    """Аргументи для кожної команди з commands.py; метод називається так само, як команда.
+
+    Аргументи готуються поза заміром. Команди, що змінюють книгу, щоразу отримують
+    випадковий запис, для якого дія має сенс, і нові значення від генератора."""
+
+    def __init__(self, generator, book):
+        self.generator = generator
+        self.rng = generator.rng
+        self.book = book
+        self.keys = list(book.data)
+
+    def pick(self, predicate=None):
+        return pick(self.book, self.keys, self.rng, predicate)
+
+    def name(self, predicate=None):
+        return self.pick(predicate).name.value.split()
+
+    def note(self, predicate=lambda record: record.notes):
+        record = self.pick(predicate)
+        return record, record.name.value.split() + record.notes[0].text.split()
+
+    def hello(self):
+        return []
+
+    def addcontact(self):
+        return self.generator.name().split() + [self.generator.phone()]
+
+    def editname(self):
+        return self.name() + self.generator.name().split()
+
+    def removecontact(self):
+        return self.name()
+
+    def search(self):
+        return [self.rng.choice(LAST_NAMES)]
+
+    def addphone(self):
+        return self.name() + [self.generator.phone()]
+
+    def changephone(self):
+        record = self.pick(lambda record: record.phones)
+        return record.name.value.split() + [record.phones[0].value, self.generator.phone()]
+
+    def removephone(self):
+        record = self.pick(lambda record: len(record.phones) > 1)
+        return record.name.value.split() + [record.phones[-1].value]
+
+    def showphone(self):
+        return self.name()
+
+    def addbday(self):
+        return self.name(lambda record: not record.birthday) + [self.generator.birthday()]
+
+    def showbday(self):
+        return self.name(lambda record: record.birthday)
+
+    def editbday(self):
+        return self.name(lambda record: record.birthday) + [self.generator.birthday()]
+
+    def removebday(self):
+        return self.name(lambda record: record.birthday)
+
+    def upcomingbdays(self):
+        return []
+
+    def addemail(self):
+        args = self.name(lambda record: not record.email)
+        return args + [self.generator.email(" ".join(args))]
+
+    def editemail(self):
+        args = self.name(lambda record: record.email)
+        return args + [self.generator.email(" ".join(args))]
+
+    def removeemail(self):
+        return self.name(lambda record: record.email)
+
+    def addaddress(self):
+        return self.name(lambda record: not record.address) + self.generator.address().split()
+
+    def editaddress(self):
+        return self.name(lambda record: record.address) + self.generator.address().split()
+
+    def removeaddress(self):
+        return self.name(lambda record: record.address)
+
+    def addnote(self):
+        return self.name() + self.generator.note_text().split() + [f"#{self.rng.choice(TAGS)}"]
+
+    def editnote(self):
+        return self.note()[1] + self.generator.note_text().split()
+
+    def removenote(self):
+        return self.note()[1]
+
+    def searchnote(self):
+        return [self.rng.choice(NOTE_WORDS)]
+
+    def addtag(self):
+        record, args = self.note(lambda record: record.notes and len(record.notes[0].tags) < len(TAGS))
+        return args + [self.rng.choice([tag for tag in TAGS if tag not in record.notes[0].tags])]
+
+    def removetag(self):
+        record, args = self.note(lambda record: record.notes and record.notes[0].tags)
+        return args + [f"#{record.notes[0].tags[0]}"] if record.notes[0].tags else args
+
+    def searchtag(self):
+        return [f"#{self.rng.choice(TAGS)}"]
+
+    def sorttag(self):
+        return []
+
+
+# Підсумок замірів у мілісекундах. Перший виклик може будувати індекси, тому він іде окремо
+# (first_ms), а решта показників рахується по наступних викликах, якщо вони є.
+def summarize(kind, name, size, timings):
+    timings_ms = [timing * 1000 for timing in timings]
+    warm = timings_ms[1:] or timings_ms
+    return {
+        "kind": kind,
+        "name": name,
+        "size": size,
+        "runs": len(timings_ms),
+        "first_ms": round(timings_ms[0], 4),
+        "min_ms": round(min(warm), 4),
+        "median_ms": round(statistics.median(warm), 4),
+        "mean_ms": round(statistics.fmean(warm), 4),
+        "max_ms": round(max(warm), 4),
+    }
+
+# Усі команди, обробники яких живуть у commands.py, у порядку реєстрації
+def command_names():
+    return [name for name in registry_names() if (get_command(name).handler_path or "").startswith("assistant_bot.commands:")]
+
+def bench_commands(book, generator, size, repeat, only=None):
+    scenarios = CommandScenarios(generator, book)
+    results = []
+    for name in command_names():
+        if only and name not in only:
+            continue
+        handler = get_command(name).handler
+        build_args = getattr(scenarios, name)
+        timings = []
+        for _ in range(repeat):
+            args = build_args()
+            start = time.perf_counter()
+            reply = handler(args, book, command=name)
+            timings.append(time.perf_counter() - start)
+            if isinstance(reply, str) and reply.startswith(ERROR_MARKS):
+                raise BenchmarkError(f"'{name} {' '.join(args)}' failed on {size} contacts: {reply}")
+        results.append(summarize("command", name, size, timings))
+    return results
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+# Повне збереження і завантаження книги в обох сховищах, а також збереження однієї зміни в журнал
+def bench_storage(book, generator, size, repeat, directory):
+    results = []
+    snapshot = os.path.join(directory, f"book_{size}.pkl")
+    database = os.path.join(directory, f"book_{size}.db")
+    timings = {name: [] for name in ("save_snapshot", "save_journal", "load", "load_find", "load_search",
+                                     "sqlite_save_all", "sqlite_load", "sqlite_load_find")}
+    keys = list(book.data)
+    for _ in range(repeat):
+        book._synced_file = None
+        timings["save_snapshot"].append(timed(save_address_book, book, snapshot)[0])
+        record = pick(book, keys, generator.rng)
+        record.add_phone(generator.phone(), book)
+        timings["save_journal"].append(timed(save_address_book, book, snapshot)[0])
+        timings["load"].append(timed(load_address_book, snapshot)[0])
+        name = pick(book, keys, generator.rng).name.value
+        timings["load_find"].append(timed(lambda: load_address_book(snapshot).find(name))[0])
+        timings["load_search"].append(timed(lambda: load_address_book(snapshot).search(LAST_NAMES[0]))[0])
+
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(database + suffix):
+                os.remove(database + suffix)
+        storage = open_storage(database)
+        for key in book.data:
+            book._dirty[key] = "add"
+        timings["sqlite_save_all"].append(timed(storage.save, book)[0])
+        storage.close()
+        storage = open_storage(database)
+        timings["sqlite_load"].append(timed(storage.load)[0])
+        storage.close()
+        storage = open_storage(database)
+        timings["sqlite_load_find"].append(timed(lambda: storage.load().find(name))[0])
+        storage.close()
+    for name, values in timings.items():
+        results.append(summarize("storage", name, size, values))
+    return results
+
+def run(sizes=DEFAULT_SIZES, repeat=DEFAULT_REPEAT, seed=0, only=None, storage=True, log=sys.stderr):
+    results = []
+    with tempfile.TemporaryDirectory(prefix="assistant_bot_bench_") as directory:
+        for size in sizes:
+            generator = BookGenerator(seed)
+            elapsed, book = timed(generator.book, size)
+            log.write(f"📚 {size} contacts generated in {elapsed:.2f} s\n")
+            results.append(summarize("generate", "generate_book", size, [elapsed]))
+            # Замір сховища йде першим, поки книга така, як її згенеровано
+            if storage and not only:
+                results += bench_storage(book, generator, size, repeat, directory)
+            results += bench_commands(book, generator, size, repeat, only)
+            for result in results:
+                if result["size"] == size:
+                    log.write(f"{size:>9} {result['kind']:<9} {result['name']:<18} median {result['median_ms']:>12.3f} ms\n")
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "sizes": list(sizes),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+# Порівнює медіани двох запусків; повертає рядки (назва, розмір, було, стало, відношення)
+def compare(old, new):
+    old_results = {(result["kind"], result["name"], result["size"]): result for result in old["results"]}
+    rows = []
+    for result in new["results"]:
+        previous = old_results.get((result["kind"], result["name"], result["size"]))
+        if previous is None:
+            continue
+        ratio = result["median_ms"] / previous["median_ms"] if previous["median_ms"] else float("inf")
+        rows.append((result["kind"], result["name"], result["size"], previous["median_ms"], result["median_ms"], ratio))
+    return rows
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmarks", description="Benchmarks for assistant_bot commands and storage.")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="comma-separated book sizes (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="runs per command (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the book generator (default: %(default)s)")
+    parser.add_argument("--commands", help="comma-separated commands to time (default: all, plus storage)")
+    parser.add_argument("--no-storage", action="store_true", help="skip the storage round-trip")
+    parser.add_argument("--output", default="bench_results.json", help="JSON results file (default: %(default)s)")
+    parser.add_argument("--compare", metavar="OLD_JSON", help="print median ratios against an earlier results file")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    options = parse_args(argv)
+    sizes = [int(size.replace("_", "")) for size in options.sizes.split(",") if size.strip()]
+    only = set(options.commands.split(",")) if options.commands else None
+    try:
+        report = run(sizes, options.repeat, options.seed, only, storage=not options.no_storage)
+    except BenchmarkError as e:
+        print(f"😓 {e}", file=sys.stderr)
+        return 1
+    with open(options.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"📊 Results written to '{options.output}'.")
+    if options.compare:
+        with open(options.compare, encoding="utf-8") as file:
+            old = json.load(file)
+        for kind, name, size, before, after, ratio in compare(old, report):
+            mark = "⚠️" if ratio > 1.2 else "  "
+            print(f"{mark} {size:>9} {kind:<9} {name:<18} {before:>12.3f} -> {after:>12.3f} ms  x{ratio:.2f}")
+    return 0
@@ -0,0 +1,137 @@
+import argparse # Імпортуємо argparse для параметрів стрес-тесту
+import random # Імпортуємо random для вибору дій у кожному потоці
+import sys # Імпортуємо sys для коду виходу
+import threading # Імпортуємо threading для потоків, що одночасно працюють з книгою
+import time # Імпортуємо time для тривалості тесту
+from assistant_bot.registry import execute_command # Імпортуємо execute_command, щоб іти тим самим шляхом, що й бот
+from .generator import BookGenerator, LAST_NAMES # Імпортуємо генератор синтетичних книг
+
+# Перевіряє узгодженість книги з її індексами; повертає список знайдених порушень
+def check_book(book, expected_size=None):
+    problems = []
+    keys = set(book.data)
+    if expected_size is not None and len(keys) != expected_size:
+        problems.append(f"{len(keys)} contacts instead of {expected_size}")
+    if set(book._order) != keys:
+        problems.append("order index does not match the contacts")
+    named = {key for names in book._names.values() for key in names}
+    if named != keys:
+        problems.append("name index does not match the contacts")
+    for phone, key in list(book._phones.items()):
+        record = book.data.get(key)
+        if record is None or not any(p.value == phone for p in record.phones):
+            problems.append(f"phone {phone} points to '{key}', which does not have it")
+    return problems
+
+
+class Worker(threading.Thread):
+    """Потік, що до зупинки виконує випадкові команди: лише читання або ще й зміни.
+
+    Зміни не змінюють кількість контактів (editname туди й назад, addphone + removephone),
+    тож читач може перевіряти книгу, поки інші потоки її змінюють."""
+
+    def __init__(self, book, generator, keys, stop, writer, check_every, seed):
+        super().__init__(daemon=True)
+        self.book = book
+        self.generator = generator
+        self.keys = keys
+        self.stop = stop
+        self.writer = writer
+        self.check_every = check_every
+        self.rng = random.Random(seed)
+        self.operations = 0
+        self.errors = []
+        self.problems = []
+
+    def run(self):
+        size = len(self.keys)
+        while not self.stop.is_set():
+            try:
+                if self.writer:
+                    self.mutate()
+                else:
+                    self.read()
+                    if self.check_every and self.operations % self.check_every == 0:
+                        with self.book.reading():
+                            self.problems += check_book(self.book, size)
+            except Exception as e:
+                self.errors.append(f"{type(e).__name__}: {e}")
+            self.operations += 1
+
+    def read(self):
+        choice = self.rng.random()
+        if choice < 0.4:
+            execute_command("search", [self.rng.choice(LAST_NAMES)], self.book)
+        elif choice < 0.8:
+            execute_command("showphone", self.rng.choice(self.keys).split(), self.book)
+        else:
+            execute_command("upcomingbdays", ["30"], self.book)
+
+    # Кожна дія складається з кількох команд; між ними інший потік може змінити книгу,
+    # але кожна команда сама по собі атомарна
+    def mutate(self):
+        index = self.rng.randrange(len(self.keys))
+        name = self.keys[index]
+        if self.rng.random() < 0.5:
+            temporary = f"{name} Tmp"
+            result, _ = execute_command("editname", name.split() + temporary.split(), self.book)
+            if "changed" in result.lower():
+                execute_command("editname", temporary.split() + name.split(), self.book)
+        else:
+            phone = self.generator.phone()
+            result, _ = execute_command("addphone", name.split() + [phone], self.book)
+            if "added" in result.lower():
+                execute_command("removephone", name.split() + [phone], self.book)
+
+
+def run(contacts=2000, readers=8, writers=4, seconds=5.0, seed=0, locking=True, check_every=50, log=sys.stderr):
+    generator = BookGenerator(seed)
+    book = generator.book(contacts)
+    if locking:
+        book.enable_locking()
+    # Кожен записувач змінює лише свої контакти, щоб дві пари команд не заважали одна одній
+    keys = list(book.data)
+    stop = threading.Event()
+    workers = [Worker(book, generator, keys, stop, False, check_every, seed + n) for n in range(readers)]
+    for n in range(writers):
+        own = keys[n::writers]
+        workers.append(Worker(book, generator, own, stop, True, 0, seed + readers + n))
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    reads = sum(worker.operations for worker in workers if not worker.writer)
+    writes = sum(worker.operations for worker in workers if worker.writer)
+    errors = [error for worker in workers for error in worker.errors]
+    problems = [problem for worker in workers for problem in worker.problems]
+    final = check_book(book, contacts)
+    log.write(
+        f"🔒 locking {'on' if locking else 'off'}: {readers} readers, {writers} writers, {seconds:.1f} s\n"
+        f"   {reads} reads ({reads / seconds:.0f}/s), {writes} write pairs ({writes / seconds:.0f}/s)\n"
+        f"   {len(errors)} exceptions, {len(problems)} torn reads, {len(final)} problems at the end\n"
+    )
+    for message in (errors + problems + final)[:10]:
+        log.write(f"   ⚠️ {message}\n")
+    return {"reads": reads, "writes": writes, "errors": errors, "problems": problems, "final": final}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmarks.stress", description="Hammer one address book from many threads.")
+    parser.add_argument("--contacts", type=int, default=2000, help="book size (default: %(default)s)")
+    parser.add_argument("--readers", type=int, default=8, help="reader threads (default: %(default)s)")
+    parser.add_argument("--writers", type=int, default=4, help="writer threads (default: %(default)s)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="test duration (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the book generator (default: %(default)s)")
+    parser.add_argument("--no-locking", action="store_true", help="run without the book lock to see what breaks")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    options = parse_args(argv)
+    result = run(options.contacts, options.readers, options.writers, options.seconds, options.seed,
+                 locking=not options.no_locking)
+    failed = result["errors"] or result["problems"] or result["final"]
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
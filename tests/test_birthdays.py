@@ -0,0 +1,74 @@
+import csv # Імпортуємо csv, щоб прочитати експортований файл
+import os # Імпортуємо os для шляхів у тимчасовій теці
+import tempfile # Імпортуємо tempfile для файлу експорту
+import unittest # Імпортуємо unittest - тести запускаються і без сторонніх пакетів
+from datetime import date, timedelta # Імпортуємо date і timedelta, щоб день народження завжди був найближчим
+from assistant_bot.book import AddressBook # Імпортуємо AddressBook - книгу, з якою працюють команди
+from assistant_bot.registry import execute_command # Імпортуємо execute_command, щоб іти тим самим шляхом, що й бот
+
+
+class BirthdaysAfterNameIndexTest(unittest.TestCase):
+    """Команди з днями народження працюють і після того, як уже побудовано індекс імен."""
+
+    def setUp(self):
+        self.book = AddressBook()
+        self.birthday = date.today() + timedelta(days=3)
+        execute_command("addcontact", ["Ivan", "Petrenko", "0501234567"], self.book)
+        execute_command("addbday", ["Ivan", "Petrenko", self.birthday.replace(year=1990).strftime("%d.%m.%Y")], self.book)
+        # Нечітка підказка імені будує NameIndex (індекс, що будується лише з ключів)
+        result, _ = execute_command("showphone", ["Ivna"], self.book)
+        self.assertIn("Ivan Petrenko", result)
+
+    def test_upcoming_birthdays(self):
+        result, _ = execute_command("upcomingbdays", ["30"], self.book)
+        self.assertIn("Ivan Petrenko", result)
+
+    def test_export_by_month(self):
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "month.csv")
+            result, _ = execute_command("export", [filename, "--month", str(self.birthday.month)], self.book)
+            self.assertTrue(result.startswith("📤"), result)
+            with open(filename, newline="", encoding="utf-8") as file:
+                rows = list(csv.DictReader(file))
+        self.assertEqual([row["name"] for row in rows], ["Ivan Petrenko"])
+
+
+
+class BirthdayWindowTest(unittest.TestCase):
+    """Межі вікна днів народження: завеликий проміжок, 29 лютого і перехід через Новий рік."""
+
+    def setUp(self):
+        self.book = AddressBook()
+        for name, phone, birthday in (
+            ("Leap Day", "0501111111", "29.02.1996"),
+            ("New Year", "0502222222", "02.01.1990"),
+            ("Old Year", "0503333333", "30.12.1985"),
+        ):
+            execute_command("addcontact", name.split() + [phone], self.book)
+            execute_command("addbday", name.split() + [birthday], self.book)
+
+    def between(self, start, end):
+        return [(record.name.value, birthday) for record, birthday in self.book.birthdays_between(start, end)]
+
+    def test_huge_day_count_is_rejected(self):
+        result, _ = execute_command("upcomingbdays", ["9" * 30], self.book)
+        self.assertEqual(result, "😓 The number of days must be from 0 to 366, for example: 'upcomingbdays 30'.")
+        result, _ = execute_command("upcomingbdays", ["366"], self.book)
+        for name in ("Leap Day", "New Year", "Old Year"):
+            self.assertIn(name, result)
+
+    def test_february_29(self):
+        # У невисокосний рік день народження 29 лютого припадає на 1 березня
+        self.assertEqual(self.between(date(2025, 2, 25), date(2025, 3, 5)), [("Leap Day", date(2025, 3, 1))])
+        self.assertEqual(self.between(date(2028, 2, 25), date(2028, 3, 5)), [("Leap Day", date(2028, 2, 29))])
+        self.assertEqual(self.between(date(2025, 2, 25), date(2025, 2, 28)), [])
+
+    def test_year_wrap(self):
+        self.assertEqual(self.between(date(2025, 12, 28), date(2026, 1, 5)),
+                         [("Old Year", date(2025, 12, 30)), ("New Year", date(2026, 1, 2))])
+        result, _ = execute_command("upcomingbdays", ["28.12.2025", "05.01.2026"], self.book)
+        self.assertEqual(result.splitlines(), ["Old Year: 30.12.2025", "New Year: 02.01.2026"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os # Імпортуємо os для шляхів у тимчасовій теці
+import tempfile # Імпортуємо tempfile для файлів книги
+import unittest # Імпортуємо unittest - тести запускаються і без сторонніх пакетів
+from assistant_bot.storage import open_storage, journal_filename, JOURNAL_COMPACT_SIZE # Імпортуємо сховище pickle з журналом змін
+from assistant_bot.registry import execute_command # Імпортуємо execute_command, щоб іти тим самим шляхом, що й бот
+
+
+class JournalReplayTest(unittest.TestCase):
+    """Після відтворення журналу індекси імен і телефонів відповідають відтвореним записам."""
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.folder.name, "book.pkl")
+        self.storage = open_storage(self.filename)
+        self.book = self.storage.load()
+        execute_command("addcontact", ["Bob", "0501111111"], self.book)
+        execute_command("addcontact", ["Ann", "0502222222"], self.book)
+        # Перше збереження пише знімок, наступні - лише журнал
+        self.storage.save(self.book)
+
+    def tearDown(self):
+        self.storage.close()
+        self.folder.cleanup()
+
+    def run_command(self, command, *args):
+        result, _ = execute_command(command, list(args), self.book)
+        return result
+
+    # Зберігає зміни в журнал і читає книгу з файлів заново
+    def save_and_reload(self):
+        self.storage.save(self.book)
+        self.storage.close()
+        self.storage = open_storage(self.filename)
+        self.book = self.storage.load()
+        self.assert_indexes_match(self.book)
+        return self.book
+
+    def assert_indexes_match(self, book):
+        keys = set(book.data)
+        self.assertEqual({key for names in book._names.values() for key in names}, keys)
+        phones = {phone.value: key for key, record in book.data.items() for phone in record.phones}
+        self.assertEqual(book._phones, phones)
+
+    def test_phone_moved_between_contacts(self):
+        # Bob стає зміненим раніше за Ann, тож у журналі він іде першим
+        self.run_command("addemail", "Bob", "bob@example.com")
+        self.run_command("removephone", "Ann", "0502222222")
+        self.run_command("addphone", "Bob", "0502222222")
+        self.storage.save(self.book)
+        self.assertTrue(os.path.exists(journal_filename(self.filename)))
+        self.save_and_reload()
+        self.assertTrue(self.run_command("showphone", "0502222222").startswith("Bob"))
+        self.assertIn("already belongs to 'Bob'", self.run_command("addphone", "Ann", "0502222222"))
+
+    def test_replay_after_editname(self):
+        self.run_command("editname", "Ann", "Anna", "Koval")
+        self.save_and_reload()
+        self.assertIsNone(self.book.find("Ann"))
+        self.assertEqual(self.book.find("anna koval").phones[0].value, "0502222222")
+        self.assertTrue(self.run_command("showphone", "0502222222").startswith("Anna Koval"))
+        # Старе ім'я вільне, а номер так і належить перейменованому контакту
+        self.assertEqual(self.run_command("addcontact", "Ann", "0503333333"), "✅ Contact added!")
+        self.assertIn("already belongs to 'Anna Koval'", self.run_command("addphone", "Bob", "0502222222"))
+
+    def test_replay_after_removephone(self):
+        self.run_command("addphone", "Bob", "0504444444")
+        self.run_command("removephone", "Bob", "0501111111")
+        self.save_and_reload()
+        self.assertEqual([phone.value for phone in self.book.find("Bob").phones], ["0504444444"])
+        self.assertEqual(self.run_command("showphone", "0501111111"), "😓 Contact not found.")
+        self.assertEqual(self.run_command("addphone", "Ann", "0501111111"), "✅ Phone number added!")
+
+    def test_compaction_after_journal_threshold(self):
+        note = "x" * 2000
+        number = 0
+        journal = journal_filename(self.filename)
+        compacted = False
+        # Дописуємо журнал, доки він не перевищить поріг і не згорнеться у знімок
+        while not compacted:
+            for _ in range(50):
+                name = f"Person{number}"
+                self.run_command("addcontact", name, f"067{number:07d}")
+                self.run_command("addnote", name, note, str(number))
+                number += 1
+            self.run_command("editname", f"Person{number - 1}", f"Renamed{number - 1}")
+            if number == 50:
+                self.run_command("removephone", "Bob", "0501111111")
+            size = os.path.getsize(journal) if os.path.exists(journal) else 0
+            self.storage.save(self.book)
+            after = os.path.getsize(journal) if os.path.exists(journal) else 0
+            compacted = after < size
+            self.assertLess(number, 2000, "the journal was never compacted")
+        self.assertGreater(size, JOURNAL_COMPACT_SIZE // 2)
+        expected = {key: str(record) for key, record in self.book.data.items()}
+        self.save_and_reload()
+        self.assertEqual({key: str(record) for key, record in self.book.data.items()}, expected)
+        self.assertEqual(self.run_command("showphone", "0501111111"), "😓 Contact not found.")
+        last = number - 1
+        self.assertTrue(self.run_command("showphone", f"067{last:07d}").startswith(f"Renamed{last}"))
+
+
+if __name__ == "__main__":
+    unittest.main()
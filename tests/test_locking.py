@@ -0,0 +1,100 @@
+import threading # Імпортуємо threading для потоків, що одночасно працюють з книгою
+import time # Імпортуємо time для тривалості навантаження
+import unittest # Імпортуємо unittest - тести запускаються і без сторонніх пакетів
+from assistant_bot.book import AddressBook # Імпортуємо AddressBook - книгу, з якою працюють команди
+from assistant_bot.registry import execute_command # Імпортуємо execute_command, щоб іти тим самим шляхом, що й бот
+
+CONTACTS = 200
+WRITERS = 4
+READERS = 6
+SECONDS = 1.5
+
+
+class LockingStressTest(unittest.TestCase):
+    """Багато потоків читають і змінюють книгу з enable_locking(); індекси не розходяться з даними."""
+
+    def setUp(self):
+        self.book = AddressBook().enable_locking()
+        self.names = [f"Person{number} Test" for number in range(CONTACTS)]
+        for number, name in enumerate(self.names):
+            result, _ = execute_command("addcontact", name.split() + [f"050{number:07d}"], self.book)
+            self.assertEqual(result, "✅ Contact added!")
+        self.stop = threading.Event()
+        self.errors = []
+        self.torn = []
+
+    def run_thread(self, work):
+        def loop():
+            step = 0
+            while not self.stop.is_set():
+                try:
+                    work(step)
+                except Exception as e:
+                    self.errors.append(f"{type(e).__name__}: {e}")
+                step += 1
+        return threading.Thread(target=loop, daemon=True)
+
+    def check_indexes(self):
+        book = self.book
+        keys = set(book.data)
+        problems = []
+        if {key for names in book._names.values() for key in names} != keys:
+            problems.append("name index does not match the contacts")
+        if set(book._order) != keys:
+            problems.append("order index does not match the contacts")
+        for phone, key in list(book._phones.items()):
+            record = book.data.get(key)
+            if record is None or not any(p.value == phone for p in record.phones):
+                problems.append(f"phone {phone} points to '{key}', which does not have it")
+        for key, record in book.data.items():
+            for phone in record.phones:
+                if book._phones.get(phone.value) != key:
+                    problems.append(f"phone {phone.value} of '{key}' is not indexed")
+        return problems
+
+    # Кожен записувач має свої контакти: перейменовує їх туди й назад і додає та прибирає номер
+    def writer(self, number):
+        own = self.names[number::WRITERS]
+
+        def work(step):
+            name = own[step % len(own)]
+            if step % 2:
+                renamed = f"{name} Tmp"
+                result, _ = execute_command("editname", name.split() + renamed.split(), self.book)
+                self.assertIn("changed", result)
+                result, _ = execute_command("editname", renamed.split() + name.split(), self.book)
+                self.assertIn("changed", result)
+            else:
+                phone = f"067{number}{step % 1000000:06d}"
+                result, _ = execute_command("addphone", name.split() + [phone], self.book)
+                self.assertIn("added", result)
+                result, _ = execute_command("removephone", name.split() + [phone], self.book)
+                self.assertIn("removed", result)
+        return work
+
+    def reader(self, step):
+        execute_command("search", ["Person1"], self.book)
+        execute_command("showphone", [f"050{step % CONTACTS:07d}"], self.book)
+        if step % 20 == 0:
+            with self.book.reading():
+                self.torn += self.check_indexes()
+                if len(self.book) != CONTACTS:
+                    self.torn.append(f"{len(self.book)} contacts instead of {CONTACTS}")
+
+    def test_concurrent_readers_and_writers(self):
+        threads = [self.run_thread(self.writer(number)) for number in range(WRITERS)]
+        threads += [self.run_thread(self.reader) for _ in range(READERS)]
+        for thread in threads:
+            thread.start()
+        time.sleep(SECONDS)
+        self.stop.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.errors, [])
+        self.assertEqual(self.torn, [])
+        self.assertEqual(self.check_indexes(), [])
+        self.assertEqual(sorted(self.book.data), sorted(self.names))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest # Імпортуємо unittest - тести запускаються і без сторонніх пакетів
+from datetime import date, timedelta # Імпортуємо date і timedelta для днів народження в найближчі дні
+from assistant_bot.book import AddressBook # Імпортуємо AddressBook - книгу, з якою працюють команди
+from assistant_bot.registry import execute_command # Імпортуємо execute_command, щоб іти тим самим шляхом, що й бот
+
+CONTACTS = [
+    ("Ivan Petrenko", "0501234560"),
+    ("Ivanna Shevchenko", "0501234561"),
+    ("Olga Ivanova", "0501234562"),
+    ("Bo Li", "0501234563"),
+]
+
+
+class SimilarNamesTest(unittest.TestCase):
+    """Підказка "Did you mean" для невідомого імені в книзі, де є дні народження."""
+
+    def setUp(self):
+        self.book = AddressBook()
+        soon = (date.today() + timedelta(days=2)).replace(year=1990).strftime("%d.%m.%Y")
+        for name, phone in CONTACTS:
+            execute_command("addcontact", name.split() + [phone], self.book)
+            execute_command("addbday", name.split() + [soon], self.book)
+
+    def test_typo_suggests_names(self):
+        result, _ = execute_command("showphone", ["Ivna", "Petrenko"], self.book)
+        self.assertTrue(result.startswith("😓 Contact not found. 🤔 Did you mean: 'Ivan Petrenko'"), result)
+
+    def test_short_and_transposed_words(self):
+        self.assertEqual(self.book.similar_names("Bo Ly")[:1], ["Bo Li"])
+        self.assertEqual(self.book.similar_names("Olag Ivanova")[:1], ["Olga Ivanova"])
+
+    def test_unrelated_name_has_no_suggestion(self):
+        result, _ = execute_command("showbday", ["Zzzzzz"], self.book)
+        self.assertEqual(result, "😓 Contact not found.")
+
+    # Обидва індекси працюють, у якому б порядку їх не побудували
+    def test_birthday_commands_around_name_index(self):
+        for command, args in (("upcomingbdays", ["7"]), ("showphone", ["Ivna"]), ("upcomingbdays", []), ("showbday", ["Olag"])):
+            result, _ = execute_command(command, args, self.book)
+            self.assertNotIn("Something went wrong", result)
+        result, _ = execute_command("upcomingbdays", ["7"], self.book)
+        for name, _ in CONTACTS:
+            self.assertIn(name, result)
+        result, _ = execute_command("editname", ["Ivan", "Petrenko", "Ivan", "Petrenkov"], self.book)
+        self.assertIn("changed", result)
+        self.assertEqual(self.book.similar_names("Ivan Petrenko")[:1], ["Ivan Petrenkov"])
+
+
+if __name__ == "__main__":
+    unittest.main()